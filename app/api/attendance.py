@@ -1,6 +1,7 @@
 from datetime import date, datetime
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import StreamingResponse
 from beanie import PydanticObjectId
 from pydantic import BaseModel
@@ -10,9 +11,9 @@ import io
 from app.api.deps import TeacherOrAdmin, AdminOnly, require_roles
 from app.models.student import Student, AttendanceLog
 from app.models.branch import Branch
-from app.models.attendance import AttendanceRecord, AttendanceStatus
+from app.models.attendance import AttendanceRecord, AttendanceStatus, day_start, week_start_for
 from app.models.user import UserRole
-from app.services.fcm import send_attendance_notification
+from app.services.fcm import send_attendance_notifications
 
 router = APIRouter()
 
@@ -113,7 +114,7 @@ async def get_attendance_record(
         raise HTTPException(status_code=400, detail="Invalid date format (YYYY-MM-DD)")
 
     record = await AttendanceRecord.find_one(
-        {"branch_id": branch_id, "class_id": class_id, "date": d}
+        {"branch_id": branch_id, "class_id": class_id, "date": day_start(d)}
     )
     if not record:
         return {
@@ -124,7 +125,10 @@ async def get_attendance_record(
             "attendance": [],
         }
 
-    return record
+    # Keep the YYYY-MM-DD shape clients expect; storage is a midnight datetime.
+    payload = jsonable_encoder(record)
+    payload["date"] = d.isoformat()
+    return payload
 
 
 class AttendanceBulkMarkRequest(BaseModel):
@@ -164,7 +168,7 @@ async def mark_attendance_bulk(
 
     # Check if finalized
     record = await AttendanceRecord.find_one(
-        {"branch_id": branch_id, "class_id": class_id, "date": d}
+        {"branch_id": branch_id, "class_id": class_id, "date": day_start(d)}
     )
     if record and record.is_finalized:
         raise HTTPException(
@@ -176,7 +180,8 @@ async def mark_attendance_bulk(
         record = AttendanceRecord(
             branch_id=branch_id,
             class_id=class_id,
-            date=d,
+            date=day_start(d),
+            week_start=week_start_for(d),
             marked_by=str(user.id),
             attendance=attendance,
         )
@@ -184,10 +189,12 @@ async def mark_attendance_bulk(
         record.attendance = attendance
         record.marked_by = str(user.id)
         record.marked_at = datetime.utcnow()
+        record.week_start = week_start_for(d)
 
     await record.save()
 
     # Also update individual student logs for history/parent view
+    absentees: list[tuple[Student, AttendanceLog]] = []
     for att in attendance:
         try:
             s_id = PydanticObjectId(att.student_id)
@@ -209,7 +216,9 @@ async def mark_attendance_bulk(
 
             # Optional: Notify parents if status is absent
             if att.status == "absent":
-                await send_attendance_notification(student, log)
+                absentees.append((student, log))
+
+    await send_attendance_notifications(absentees)
 
     return {
         "status": "success",
@@ -240,7 +249,7 @@ async def finalize_attendance(
         raise HTTPException(status_code=400, detail="Invalid date format (YYYY-MM-DD)")
 
     record = await AttendanceRecord.find_one(
-        {"branch_id": branch_id, "class_id": class_id, "date": d}
+        {"branch_id": branch_id, "class_id": class_id, "date": day_start(d)}
     )
     if not record:
         raise HTTPException(
@@ -276,7 +285,7 @@ async def download_attendance_report(
         {
             "branch_id": branch_id,
             "class_id": class_id,
-            "date": {"$gte": d_from, "$lte": d_to},
+            "date": {"$gte": day_start(d_from), "$lte": day_start(d_to)},
         }
     ).to_list()
 
@@ -290,7 +299,7 @@ async def download_attendance_report(
         for att in record.attendance:
             data.append(
                 {
-                    "Date": record.date,
+                    "Date": record.date.date(),
                     "Student ID": att.student_id,
                     "Roll Number": student_roll_map.get(att.student_id, ""),
                     "Student Name": student_map.get(att.student_id, "Unknown"),
@@ -1,18 +1,30 @@
 """Fee management: status updates, receipt PDF, S3 storage."""
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import Response
-from beanie import PydanticObjectId
+from beanie import BulkWriter, PydanticObjectId
 
 from app.api.deps import CurrentUser, AdminOnly
 from app.models.user import UserRole
-from app.models.billing import Billing, BillingCreate, BillingPayBody, PaymentStatus
+from app.models.billing import Billing, BillingCreate, BillingPayBody, BillingReceiptsBody, PaymentStatus
 from app.models.student import Student
 from app.models.branch import Branch
-from app.models.settings import AppSettings
-from app.services.receipt import generate_receipt_pdf, generate_receipt_pdf_bytes
+from app.services.app_settings import get_app_settings
+from app.services.receipt import generate_receipt_pdf, generate_receipt_pdf_bytes, generate_receipts_pdf_bulk
 
 router = APIRouter()
 
+_BILLING_LIST_PROJECTION = {
+    "student_id": 1,
+    "fee_structure": 1,
+    "status": 1,
+    "amount_paid": 1,
+    "payment_mode": 1,
+    "transaction_number": 1,
+    "receipt_url": 1,
+}
+
 
 async def _receipt_context(b: Billing) -> dict | None:
     """Build receipt context: student_name, class_name, branch_name, components (list of (name, amount))."""
@@ -25,7 +37,7 @@ async def _receipt_context(b: Billing) -> dict | None:
             pass
     total = b.amount_paid
     components: list[tuple[str, float]] = []
-    settings = await AppSettings.find_one()
+    settings = await get_app_settings()
     if settings and getattr(settings, "fee_structures", None):
         for fs in settings.fee_structures:
             if fs.name == b.fee_structure.name and fs.components:
@@ -62,19 +74,22 @@ async def list_billing(student_id: str | None = None, user: CurrentUser = ...):
     query = {}
     if student_id:
         query["student_id"] = student_id
-    items = await Billing.find(query).to_list()
+    # Read-only listing: aggregate to raw documents and skip Beanie/Pydantic hydration.
+    docs = await Billing.aggregate(
+        [{"$match": query}, {"$project": _BILLING_LIST_PROJECTION}]
+    ).to_list()
     return [
         {
-            "id": str(b.id),
-            "student_id": b.student_id,
-            "fee_structure": b.fee_structure,
-            "status": b.status.value,
-            "amount_paid": b.amount_paid,
-            "payment_mode": getattr(b, "payment_mode", "cash"),
-            "transaction_number": getattr(b, "transaction_number", None),
-            "receipt_url": b.receipt_url,
+            "id": str(d["_id"]),
+            "student_id": d.get("student_id"),
+            "fee_structure": d.get("fee_structure"),
+            "status": d.get("status", PaymentStatus.PENDING.value),
+            "amount_paid": d.get("amount_paid", 0.0),
+            "payment_mode": d.get("payment_mode") or "cash",
+            "transaction_number": d.get("transaction_number"),
+            "receipt_url": d.get("receipt_url"),
         }
-        for b in items
+        for d in docs
     ]
 
 
@@ -125,6 +140,25 @@ async def generate_receipt(billing_id: str, user: AdminOnly):
     return {"receipt_url": b.receipt_url}
 
 
+@router.post("/generate-receipts")
+async def generate_receipts(body: BillingReceiptsBody, user: AdminOnly):
+    """Generate and upload receipts for many paid billing records at once. Returns {billing_id: receipt_url or null}; unpaid or unknown ids are skipped."""
+    if not all(PydanticObjectId.is_valid(i) for i in body.billing_ids):
+        raise HTTPException(status_code=400, detail="Invalid billing id")
+    oids = [PydanticObjectId(i) for i in body.billing_ids]
+    billings = await Billing.find({"_id": {"$in": oids}, "status": PaymentStatus.PAID.value}).to_list()
+    contexts = await asyncio.gather(*(_receipt_context(b) for b in billings))
+    urls = await generate_receipts_pdf_bulk(billings, list(contexts))
+    if any(urls):
+        async with BulkWriter() as bulk_writer:
+            for b, url in zip(billings, urls):
+                if url:
+                    await Billing.find_one(Billing.id == b.id).update(
+                        {"$set": {"receipt_url": url}}, bulk_writer=bulk_writer
+                    )
+    return {str(b.id): url for b, url in zip(billings, urls)}
+
+
 @router.get("/{billing_id}/receipt")
 async def download_receipt(billing_id: str, user: CurrentUser):
     """Generate receipt PDF on the fly (A5) and return as download. Works without S3 (e.g. local dev)."""
@@ -6,7 +6,7 @@ from app.api.deps import AdminOnly
 from app.models.student import Student
 from app.models.user import User, UserRole
 from app.models.branch import Branch
-from app.models.attendance import AttendanceRecord
+from app.models.attendance import AttendanceRecord, day_start
 from app.models.billing import Billing, PaymentStatus
 from app.models.feed import FeedPost
 from app.models.holiday import Holiday
@@ -24,7 +24,7 @@ async def get_admin_stats(admin: AdminOnly) -> Dict[str, Any]:
     
     # Attendance for today
     today = date.today()
-    attendance_records = await AttendanceRecord.find(AttendanceRecord.date == today).to_list()
+    attendance_records = await AttendanceRecord.find(AttendanceRecord.date == day_start(today)).to_list()
     
     total_present = 0
     total_absent = 0
@@ -1,23 +1,24 @@
 """Announcements & News Room - rich text posts with branch targeting."""
 from datetime import datetime
+from typing import Annotated
 
 from beanie import PydanticObjectId
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
 from app.api.deps import CurrentUser, TeacherOrAdmin
 from app.models.branch import Branch
-from app.models.feed import FeedPost, FeedPostCreate, FeedPostUpdate
+from app.models.feed import FeedPost, FeedPostCreate, FeedPostLite, FeedPostUpdate
 from app.models.user import User, UserRole
 from app.services.announcements import (
-    build_author_name_map,
-    build_branch_name_map,
+    build_name_maps,
     is_announcement_visible,
     list_announcements_for_scope,
     parent_branch_ids,
     plain_text_from_html,
     safe_object_id,
     serialize_announcement,
-    sort_announcements,
     unique_branch_ids,
 )
 from app.services.fcm import send_feed_push
@@ -25,6 +26,34 @@ from app.services.fcm import send_feed_push
 router = APIRouter()
 
 
+async def _feed_post_create_body(request: Request, _user: TeacherOrAdmin) -> FeedPostCreate:
+    """Validate the raw JSON body directly into FeedPostCreate (no intermediate dict).
+
+    Depends on the auth dependency so unauthenticated requests get 401, not 422.
+    """
+    try:
+        return FeedPostCreate.model_validate_json(await request.body())
+    except ValidationError as exc:
+        # Leave out "input": for json_invalid it is the raw body bytes, which the
+        # 422 handler cannot encode when they are not UTF-8.
+        raise RequestValidationError(
+            [
+                {"type": err["type"], "loc": ("body", *err["loc"]), "msg": err["msg"]}
+                for err in exc.errors(include_url=False, include_context=False)
+            ]
+        )
+
+
+FeedPostCreateBody = Annotated[FeedPostCreate, Depends(_feed_post_create_body)]
+# The body is read by the dependency, so describe it for the docs explicitly.
+_CREATE_BODY_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": FeedPostCreate.model_json_schema()}},
+    }
+}
+
+
 def _resolve_target_branches(payload: FeedPostCreate) -> list[str]:
     target_ids = unique_branch_ids(payload.target_branch_ids)
     legacy_branch_id = (payload.branch_id or "").strip()
@@ -52,7 +81,9 @@ async def _validate_branch_ids(target_branch_ids: list[str]) -> None:
         raise HTTPException(status_code=400, detail=f"Unknown branch_id(s): {', '.join(missing)}")
 
 
-async def _visible_posts_for_user(user: CurrentUser, branch_id: str | None) -> list[FeedPost]:
+async def _visible_posts_for_user(
+    user: CurrentUser, branch_id: str | None
+) -> list[FeedPostLite]:
     if user.role == UserRole.PARENT:
         allowed_branch_ids = set(await parent_branch_ids(user))
         if branch_id:
@@ -66,9 +97,8 @@ async def _visible_posts_for_user(user: CurrentUser, branch_id: str | None) -> l
     return await list_announcements_for_scope(None)
 
 
-async def _serialize_posts(posts: list[FeedPost]) -> list[dict]:
-    author_name_map = await build_author_name_map(posts)
-    branch_name_map = await build_branch_name_map(posts)
+async def _serialize_posts(posts: list[FeedPost] | list[FeedPostLite]) -> list[dict]:
+    author_name_map, branch_name_map = await build_name_maps(posts)
     return [serialize_announcement(post, author_name_map, branch_name_map) for post in posts]
 
 
@@ -108,7 +138,6 @@ async def list_feed(
     user: CurrentUser = ...,
 ):
     posts = await _visible_posts_for_user(user, branch_id)
-    posts = sort_announcements(posts)
     page = posts[offset : offset + limit]
     return await _serialize_posts(page)
 
@@ -121,7 +150,6 @@ async def list_announcements(
     user: CurrentUser = ...,
 ):
     posts = await _visible_posts_for_user(user, branch_id)
-    posts = sort_announcements(posts)
     total = len(posts)
     page = posts[offset : offset + limit]
     return {
@@ -177,9 +205,8 @@ async def track_announcement(post_id: str, action: str, user: CurrentUser):
         post.click_count += 1
     elif action == "view":
         post.view_count += 1
-        user_id = str(user.id)
-        if user_id not in post.viewer_ids:
-            post.viewer_ids.append(user_id)
+        if user.id not in post.viewer_ids:
+            post.viewer_ids.append(user.id)
     else:
         raise HTTPException(status_code=400, detail="Invalid action")
 
@@ -187,14 +214,14 @@ async def track_announcement(post_id: str, action: str, user: CurrentUser):
     return {"status": "ok"}
 
 
-@router.post("/", status_code=201)
-async def create_post(payload: FeedPostCreate, user: TeacherOrAdmin):
+@router.post("/", status_code=201, openapi_extra=_CREATE_BODY_OPENAPI)
+async def create_post(payload: FeedPostCreateBody, user: TeacherOrAdmin):
     post = await _create_post(payload, user)
     return {"id": str(post.id), "title": post.title}
 
 
-@router.post("/announcements", status_code=201)
-async def create_announcement(payload: FeedPostCreate, user: TeacherOrAdmin):
+@router.post("/announcements", status_code=201, openapi_extra=_CREATE_BODY_OPENAPI)
+async def create_announcement(payload: FeedPostCreateBody, user: TeacherOrAdmin):
     post = await _create_post(payload, user)
     items = await _serialize_posts([post])
     return items[0]
@@ -241,6 +268,7 @@ async def update_announcement(post_id: str, payload: FeedPostUpdate, user: Teach
         post.is_pinned = update_data["is_pinned"]
 
     post.updated_at = datetime.utcnow()
+    post.revision += 1
     await post.save()
     
     # Trigger notification for update
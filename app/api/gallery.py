@@ -10,28 +10,35 @@ from app.services.s3 import upload_album_photo_to_s3, delete_from_s3
 
 router = APIRouter()
 
-def serialize_album(album: Album) -> dict:
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+def serialize_album_doc(doc: dict) -> dict:
+    """Serialize a raw Mongo album document; serialize_album goes through this too."""
     return {
-        "id": str(album.id),
-        "name": album.name,
-        "description": album.description,
-        "branch_id": album.branch_id,
-        "cover_image_url": album.cover_image_url,
+        "id": str(doc["_id"]),
+        "name": doc.get("name"),
+        "description": doc.get("description"),
+        "branch_id": doc.get("branch_id"),
+        "cover_image_url": doc.get("cover_image_url"),
         "photos": [
             {
-                "id": p.id,
-                "url": p.url,
-                "key": p.key,
-                "caption": p.caption,
-                "created_at": p.created_at.isoformat(),
-                "uploaded_by": p.uploaded_by
-            } for p in album.photos
+                "id": p.get("id"),
+                "url": p.get("url"),
+                "key": p.get("key"),
+                "caption": p.get("caption"),
+                "created_at": _isoformat(p.get("created_at")),
+                "uploaded_by": p.get("uploaded_by")
+            } for p in doc.get("photos") or []
         ],
-        "created_at": album.created_at.isoformat(),
-        "updated_at": album.updated_at.isoformat(),
-        "created_by": album.created_by
+        "created_at": _isoformat(doc.get("created_at")),
+        "updated_at": _isoformat(doc.get("updated_at")),
+        "created_by": doc.get("created_by")
     }
 
+def serialize_album(album: Album) -> dict:
+    return serialize_album_doc(album.model_dump(by_alias=True))
+
 @router.get("/albums")
 async def list_albums(user: CurrentUser, branch_id: Optional[str] = None):
     query = {}
@@ -45,8 +52,9 @@ async def list_albums(user: CurrentUser, branch_id: Optional[str] = None):
         else:
             query["branch_id"] = None
 
-    albums = await Album.find(query).sort("-created_at").to_list()
-    return [serialize_album(a) for a in albums]
+    # Read-only listing: aggregate to raw documents instead of hydrating Album models.
+    docs = await Album.aggregate([{"$match": query}, {"$sort": {"created_at": -1}}]).to_list()
+    return [serialize_album_doc(d) for d in docs]
 
 @router.get("/albums/{album_id}")
 async def get_album(album_id: str, user: CurrentUser):
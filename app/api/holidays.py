@@ -37,8 +37,9 @@ async def list_holidays(
 @router.post("/", response_model=HolidayOut)
 async def create_holiday(data: HolidayCreate, user: TeacherOrAdmin):
     """Create a new holiday (Admin/Staff only)."""
-    if not data.academic_year:
-        data.academic_year = await get_current_academic_year()
+    fields = data.model_dump()
+    if not fields["academic_year"]:
+        fields["academic_year"] = await get_current_academic_year()
     
     # If not admin, can only create for their own branch
     if user.role != UserRole.ADMIN:
@@ -46,9 +47,9 @@ async def create_holiday(data: HolidayCreate, user: TeacherOrAdmin):
             raise HTTPException(status_code=403, detail="Cannot create holiday for another branch")
         if not data.branch_id:
             # Teachers/Staff can't create global holidays
-            data.branch_id = user.branch_id
+            fields["branch_id"] = user.branch_id
 
-    holiday = Holiday(**data.model_dump())
+    holiday = Holiday(**fields)
     await holiday.insert()
     return {
         **holiday.model_dump(),
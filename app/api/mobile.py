@@ -7,19 +7,17 @@ from fastapi import APIRouter, HTTPException, Query
 from app.api.deps import CurrentUser, ParentOnly
 from app.models.branch import Branch
 from app.models.feed import FeedPost
-from app.models.settings import AppSettings
 from app.models.student import Student
 from app.models.user import User
 from app.services.announcements import (
-    build_author_name_map,
-    build_branch_name_map,
+    build_name_maps,
     is_announcement_visible,
     list_announcements_for_scope,
     parent_branch_ids,
     safe_object_id,
     serialize_announcement,
-    sort_announcements,
 )
+from app.services.app_settings import get_app_settings
 
 router = APIRouter()
 
@@ -93,14 +91,12 @@ async def dashboard(user: CurrentUser, student_id: str | None = None):
         )
 
     posts = await list_announcements_for_scope({selected_student.branch_id})
-    posts = sort_announcements(posts)
     posts = posts[:20]
     latest_announcement = posts[0] if posts else None
     latest_news = posts[1] if len(posts) > 1 else None
 
     latest_posts = [p for p in [latest_announcement, latest_news] if p]
-    author_name_map = await build_author_name_map(latest_posts)
-    branch_name_map = await build_branch_name_map(latest_posts)
+    author_name_map, branch_name_map = await build_name_maps(latest_posts)
     latest_announcement_payload = (
         serialize_announcement(latest_announcement, author_name_map, branch_name_map)
         if latest_announcement
@@ -128,7 +124,7 @@ async def dashboard(user: CurrentUser, student_id: str | None = None):
                     }
                     break
 
-    settings = await AppSettings.find_one()
+    settings = await get_app_settings()
     cctv_enabled = settings.cctv_enabled if settings else True
 
     return {
@@ -262,12 +258,10 @@ async def list_mobile_announcements(
 
     branch_scope = {s.branch_id for s in selected_students if s.branch_id}
     posts = await list_announcements_for_scope(branch_scope)
-    posts = sort_announcements(posts)
     total = len(posts)
     page = posts[offset : offset + limit]
 
-    author_name_map = await build_author_name_map(page)
-    branch_name_map = await build_branch_name_map(page)
+    author_name_map, branch_name_map = await build_name_maps(page)
     items = [serialize_announcement(p, author_name_map, branch_name_map) for p in page]
 
     return {
@@ -282,7 +276,7 @@ async def list_mobile_announcements(
 @router.get("/banners")
 async def get_mobile_banners(user: CurrentUser):
     """Get active banners for mobile app home screen."""
-    settings = await AppSettings.find_one()
+    settings = await get_app_settings()
     if not settings or not settings.banners:
         return {"banners": []}
     active = []
@@ -307,6 +301,5 @@ async def get_mobile_announcement(announcement_id: str, user: ParentOnly):
     if not is_announcement_visible(post, allowed_branch_ids):
         raise HTTPException(status_code=403, detail="Not authorized for this announcement")
 
-    author_name_map = await build_author_name_map([post])
-    branch_name_map = await build_branch_name_map([post])
+    author_name_map, branch_name_map = await build_name_maps([post])
     return serialize_announcement(post, author_name_map, branch_name_map)
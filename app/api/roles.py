@@ -12,6 +12,8 @@ from app.models.user import User
 from app.rbac import SYSTEM_MODULES
 from app.services.roles import (
     can_edit_role,
+    invalidate_role_cache,
+    list_role_responses,
     role_to_response,
     slugify_role_key,
     _permissions_map_from_inputs,
@@ -27,8 +29,7 @@ async def list_modules(user: AdminOnly):
 
 @router.get("/")
 async def list_roles(user: AdminOnly):
-    roles = await Role.find_all().sort("name").to_list()
-    return {"items": [role_to_response(role).model_dump() for role in roles]}
+    return {"items": await list_role_responses()}
 
 
 @router.get("/{role_id}")
@@ -55,6 +56,7 @@ async def create_role(data: RoleCreateRequest, user: AdminOnly):
         permissions=_permissions_map_from_inputs(data.permissions),
     )
     await role.insert()
+    invalidate_role_cache()
     return role_to_response(role)
 
 
@@ -77,6 +79,7 @@ async def update_role(role_id: str, data: RoleUpdateRequest, user: AdminOnly):
         role.permissions = _permissions_map_from_inputs(data.permissions or [])
     role.updated_at = datetime.utcnow()
     await role.save()
+    invalidate_role_cache()
     return role_to_response(role)
 
 
@@ -98,4 +101,5 @@ async def delete_role(role_id: str, user: AdminOnly):
         )
 
     await role.delete()
+    invalidate_role_cache()
 
@@ -4,6 +4,7 @@ from app.api.deps import AdminOnly, CurrentUser
 from app.models.settings import AppSettings, ClassOptionsUpdate, FeeStructuresUpdate, AcademicYearConfig, CCTVConfigUpdate, BannerItem, BannerListUpdate
 from app.models.academic_year import AcademicYear, AcademicYearConfigUpdate
 from app.services.academic_year import ensure_academic_year
+from app.services.app_settings import get_app_settings, invalidate_app_settings
 from app.services.s3 import upload_banner_to_s3, delete_from_s3
 
 router = APIRouter()
@@ -31,7 +32,7 @@ async def get_current_ay(user: CurrentUser):
 @router.get("/academic-year-config")
 async def get_ay_config(admin: AdminOnly):
     """Get academic year configuration."""
-    settings = await AppSettings.find_one()
+    settings = await get_app_settings()
     return settings.academic_year_config if settings else AcademicYearConfig()
 
 
@@ -45,6 +46,7 @@ async def update_ay_config(data: AcademicYearConfigUpdate, admin: AdminOnly):
     
     settings.academic_year_config = AcademicYearConfig(**data.model_dump())
     await settings.save()
+    invalidate_app_settings()
     
     # Trigger re-calculation/re-generation
     await ensure_academic_year()
@@ -54,7 +56,7 @@ async def update_ay_config(data: AcademicYearConfigUpdate, admin: AdminOnly):
 
 @router.get("/class-options")
 async def get_class_options(user: CurrentUser):
-    settings = await AppSettings.find_one()
+    settings = await get_app_settings()
     if not settings:
         return {"class_options": []}
     return {"class_options": settings.class_options}
@@ -69,12 +71,13 @@ async def update_class_options(data: ClassOptionsUpdate, user: AdminOnly):
     else:
         settings.class_options = data.class_options
         await settings.save()
+    invalidate_app_settings()
     return {"class_options": settings.class_options}
 
 
 @router.get("/fee-structures")
 async def get_fee_structures(user: CurrentUser):
-    settings = await AppSettings.find_one()
+    settings = await get_app_settings()
     if not settings:
         return {"fee_structures": []}
     # Backward compat: old fee_structure (single list) becomes one fee structure
@@ -93,12 +96,13 @@ async def update_fee_structures(data: FeeStructuresUpdate, user: AdminOnly):
     else:
         settings.fee_structures = data.fee_structures
         await settings.save()
+    invalidate_app_settings()
     return {"fee_structures": settings.fee_structures}
 
 
 @router.get("/cctv-config")
 async def get_cctv_config(user: CurrentUser):
-    settings = await AppSettings.find_one()
+    settings = await get_app_settings()
     return {"cctv_enabled": settings.cctv_enabled if settings else True}
 
 
@@ -111,13 +115,14 @@ async def update_cctv_config(data: CCTVConfigUpdate, user: AdminOnly):
     else:
         settings.cctv_enabled = data.cctv_enabled
         await settings.save()
+    invalidate_app_settings()
     return {"cctv_enabled": settings.cctv_enabled}
 
 
 @router.get("/banners")
 async def get_banners(user: CurrentUser):
     """Get all banners (for admin settings UI)."""
-    settings = await AppSettings.find_one()
+    settings = await get_app_settings()
     if not settings:
         return {"banners": []}
     banners = settings.banners or []
@@ -154,6 +159,7 @@ async def upload_banner(file: UploadFile = File(...), admin: AdminOnly = None):
     banners.append(banner)
     settings.banners = banners
     await settings.save()
+    invalidate_app_settings()
     return {"banner": banner.model_dump()}
 
 
@@ -175,6 +181,7 @@ async def update_banners(data: BannerListUpdate, admin: AdminOnly):
 
     settings.banners = data.banners
     await settings.save()
+    invalidate_app_settings()
     return {"banners": [b.model_dump() for b in data.banners]}
 
 
@@ -194,4 +201,5 @@ async def delete_banner(index: int, admin: AdminOnly):
     banners.pop(index)
     settings.banners = banners
     await settings.save()
+    invalidate_app_settings()
     return {"message": "Banner deleted"}
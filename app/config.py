@@ -16,6 +16,7 @@ class Settings(BaseSettings):
     school_logo_url: str = ""  # optional; if set, shown on receipt instead of school name
     trust_logo_url: str = ""  # optional; logo at bottom of receipt
     trust_address: str = ""  # optional; address text at bottom of receipt
+    receipt_pdf_workers: int = 2  # ReportLab render processes per app worker
 
     # MongoDB
     mongodb_url: str = "mongodb://localhost:27017"
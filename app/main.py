@@ -11,8 +11,10 @@ async def lifespan(app: FastAPI):
     # Start-up
     await db_startup()
     await ensure_default_roles()
+    await backfill_announcement_targets()
     yield
     # Shutdown
+    shutdown_pdf_pool()
     await db_shutdown()
 
 
@@ -54,6 +56,8 @@ app.include_router(gallery.router, prefix="/api/gallery", tags=["Gallery"])
 
 
 from app.services.roles import ensure_default_roles
+from app.services.announcements import backfill_announcement_targets
+from app.services.receipt import shutdown_pdf_pool
 from fastapi.staticfiles import StaticFiles
 import os
 
@@ -3,6 +3,8 @@ from typing import Optional
 from beanie import Document, Indexed
 from pydantic import Field, BaseModel
 
+from app.models.base import RequestModel
+
 class AcademicYear(Document):
     """Academic year master records."""
     name: Indexed(str, unique=True)  # e.g., "2025-26"
@@ -16,10 +18,10 @@ class AcademicYear(Document):
         name = "academic_years"
         use_state_management = True
 
-class AcademicYearUpdate(BaseModel):
+class AcademicYearUpdate(RequestModel):
     is_current: Optional[bool] = None
 
-class AcademicYearConfigUpdate(BaseModel):
+class AcademicYearConfigUpdate(RequestModel):
     start_month: int
     start_day: int
     end_month: int
@@ -5,6 +5,8 @@ from typing import Optional
 from beanie import Document, Indexed
 from pydantic import BaseModel, Field
 
+from app.models.base import RequestModel
+
 
 class PhotoMetadata(BaseModel):
     s3_key: str
@@ -27,10 +29,11 @@ class Activity(Document):
 
     class Settings:
         name = "activities"
-        use_state_management = True
+        # Written whole on every mark/update; no diff snapshot needed on load.
+        use_state_management = False
 
 
-class ActivityCreate(BaseModel):
+class ActivityCreate(RequestModel):
     student_id: str
     date: str
     lesson_progress: Optional[str] = None
@@ -1,8 +1,19 @@
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta
 from typing import Optional
 from beanie import Document, Indexed
 from pydantic import Field, BaseModel
 
+
+def day_start(day: date) -> datetime:
+    """Midnight of `day`; BSON has no date-only type, so records store datetimes."""
+    return datetime.combine(day, time.min)
+
+
+def week_start_for(day: date) -> datetime:
+    """Midnight of the Monday of the week containing `day`."""
+    return day_start(day) - timedelta(days=day.weekday())
+
+
 class AttendanceStatus(BaseModel):
     student_id: str
     status: str  # present, absent
@@ -11,7 +22,8 @@ class AttendanceRecord(Document):
     """Attendance record for a class on a specific date."""
     branch_id: Indexed(str)
     class_id: Indexed(str)
-    date: Indexed(date)
+    date: Indexed(datetime)  # midnight of the attendance day
+    week_start: Optional[datetime] = None  # Monday of `date`; set on insert for weekly queries
     marked_at: datetime = Field(default_factory=datetime.utcnow)
     marked_by: str  # user_id
     is_finalized: bool = False
@@ -26,4 +38,6 @@ class AttendanceRecord(Document):
 
     class Settings:
         name = "attendance_records"
-        use_state_management = True
+        # Written whole on every mark/update; no diff snapshot needed on load.
+        use_state_management = False
+        indexes = ["week_start"]
@@ -0,0 +1,12 @@
+"""Shared base for request payload schemas."""
+from pydantic import BaseModel, ConfigDict
+
+
+class RequestModel(BaseModel):
+    """Base for *Create/*Update payloads: parsed once per request, then only read.
+
+    Unknown keys are dropped and instances are immutable; handlers that need to
+    fill in defaults should build a dict from model_dump() instead of assigning.
+    """
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
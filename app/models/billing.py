@@ -6,6 +6,8 @@ from typing import Optional
 from beanie import Document, Indexed
 from pydantic import BaseModel, Field
 
+from app.models.base import RequestModel
+
 
 class PaymentStatus(str, Enum):
     PENDING = "pending"
@@ -39,7 +41,7 @@ class Billing(Document):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
-class BillingPayBody(BaseModel):
+class BillingPayBody(RequestModel):
     amount_paid: float
     payment_mode: str = "cash"  # "cash" | "online"
     transaction_number: Optional[str] = None
@@ -49,7 +51,11 @@ class BillingPayBody(BaseModel):
         use_state_management = True
 
 
-class BillingCreate(BaseModel):
+class BillingReceiptsBody(RequestModel):
+    billing_ids: list[str] = Field(min_length=1, max_length=100)
+
+
+class BillingCreate(RequestModel):
     student_id: str
     branch_id: str
     fee_structure: FeeStructure
@@ -2,7 +2,9 @@
 from typing import Optional
 
 from beanie import Document, Indexed
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from app.models.base import RequestModel
 
 
 class ClassFeeStructureMapping(BaseModel):
@@ -21,6 +23,16 @@ class CCTVConfig(BaseModel):
     token_secret: str  # For signed URL generation
     enabled: bool = True
 
+    # Private, so it is never serialized or stored with the branch.
+    _token_secret_bytes: Optional[bytes] = PrivateAttr(default=None)
+
+    @property
+    def token_secret_bytes(self) -> bytes:
+        """token_secret encoded once for HMAC signing."""
+        if self._token_secret_bytes is None:
+            self._token_secret_bytes = self.token_secret.encode()
+        return self._token_secret_bytes
+
 
 class Branch(Document):
     """Branch/location with CCTV configs."""
@@ -44,13 +56,13 @@ class Branch(Document):
         use_state_management = True
 
 
-class BranchCreate(BaseModel):
+class BranchCreate(RequestModel):
     """Only name is required when creating; rest editable from branch details."""
     name: str
     code: Optional[str] = None
 
 
-class BranchUpdate(BaseModel):
+class BranchUpdate(RequestModel):
     name: Optional[str] = None
     code: Optional[str] = None
     classes: Optional[list[str]] = None
@@ -2,8 +2,11 @@
 from datetime import datetime
 from typing import Optional
 
-from beanie import Document, Indexed
-from pydantic import BaseModel, Field, model_validator
+from beanie import Document, Indexed, Insert, PydanticObjectId, Replace, Save, before_event
+from pymongo import DESCENDING
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.models.base import RequestModel
 
 
 class FeedPost(Document):
@@ -22,18 +25,50 @@ class FeedPost(Document):
     is_pinned: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Bumped on every edit; push notifications for revision > 1 are "Update:"s.
+    revision: int = 1
 
     # Analytics
     click_count: int = 0
     view_count: int = 0
-    viewer_ids: list[str] = Field(default_factory=list)
+    # Stored as 12-byte ObjectIds; legacy hex strings are coerced on load.
+    viewer_ids: list[PydanticObjectId] = Field(default_factory=list)
+
+    @before_event(Insert, Replace, Save)
+    def merge_legacy_branch(self):
+        """Keep branch_id inside target_branch_ids so visibility is one indexed field."""
+        legacy_branch_id = (self.branch_id or "").strip()
+        if legacy_branch_id and legacy_branch_id not in self.target_branch_ids:
+            self.target_branch_ids.append(legacy_branch_id)
 
     class Settings:
         name = "feed"
         use_state_management = True
+        indexes = [
+            # Serves the pinned-first, newest-first ordering of every listing.
+            [("is_pinned", DESCENDING), ("created_at", DESCENDING)],
+            "target_branch_ids",
+        ]
+
+
+class FeedPostLite(BaseModel):
+    """Projection of FeedPost with just the fields list/serialize paths read."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    branch_id: Optional[str] = None
+    target_branch_ids: list[str] = Field(default_factory=list)
+    title: str
+    content: str = ""
+    content_html: Optional[str] = None
+    author_id: str
+    is_pinned: bool = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
 
-class FeedPostCreate(BaseModel):
+class FeedPostCreate(RequestModel):
     title: str
     content: Optional[str] = None
     content_html: Optional[str] = None
@@ -60,7 +95,7 @@ class FeedPostCreate(BaseModel):
         return self
 
 
-class FeedPostUpdate(BaseModel):
+class FeedPostUpdate(RequestModel):
     title: Optional[str] = None
     content: Optional[str] = None
     content_html: Optional[str] = None
@@ -1,10 +1,17 @@
 from datetime import datetime
 from typing import Optional, List
 from beanie import Document, Indexed
+from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.base import RequestModel
+
+def _photo_id() -> str:
+    # ObjectId embeds a per-process counter, so ids stay unique within a bulk upload.
+    return str(ObjectId())
+
 class Photo(BaseModel):
-    id: str = Field(default_factory=lambda: datetime.utcnow().strftime("%Y%m%d%H%M%S%f"))
+    id: str = Field(default_factory=_photo_id)
     url: str
     key: str  # S3 key
     caption: Optional[str] = None
@@ -25,12 +32,12 @@ class Album(Document):
         name = "albums"
         use_state_management = True
 
-class AlbumCreate(BaseModel):
+class AlbumCreate(RequestModel):
     name: str
     description: Optional[str] = None
     branch_id: Optional[str] = None
 
-class AlbumUpdate(BaseModel):
+class AlbumUpdate(RequestModel):
     name: Optional[str] = None
     description: Optional[str] = None
     branch_id: Optional[str] = None
@@ -1,7 +1,9 @@
 import datetime
 from typing import Optional, List
 from beanie import Document, Indexed
-from pydantic import Field, BaseModel, ConfigDict
+from pydantic import Field, BaseModel
+
+from app.models.base import RequestModel
 
 class Holiday(Document):
     """School holiday calendar model."""
@@ -31,8 +33,7 @@ class HolidayOut(BaseModel):
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
-class HolidayCreate(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+class HolidayCreate(RequestModel):
     name: str
     date: datetime.date
     end_date: Optional[datetime.date] = None
@@ -40,8 +41,7 @@ class HolidayCreate(BaseModel):
     description: Optional[str] = None
     branch_id: Optional[str] = None
 
-class HolidayUpdate(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+class HolidayUpdate(RequestModel):
     name: Optional[str] = None
     date: Optional[datetime.date] = None
     end_date: Optional[datetime.date] = None
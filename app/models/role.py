@@ -2,22 +2,66 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any, Mapping
 
 from beanie import Document, Indexed
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
+from app.models.base import RequestModel
 from app.rbac import SYSTEM_MODULES
 
 MODULE_KEYS = {m["key"] for m in SYSTEM_MODULES}
 
 
+# Bit per action; a module's permissions pack into 4 bits.
+ACTION_BITS: dict[str, int] = {"view": 1, "add": 2, "edit": 4, "delete": 8}
+
+
 class PermissionSet(BaseModel):
+    """Immutable; use pset_from_int()/pset_from_flags() to get a shared instance."""
+
+    model_config = ConfigDict(frozen=True)
+
     view: bool = False
     add: bool = False
     edit: bool = False
     delete: bool = False
 
 
+def pset_to_int(perm: PermissionSet | RolePermissionInput) -> int:
+    return perm.view | perm.add << 1 | perm.edit << 2 | perm.delete << 3
+
+
+_PSET_CACHE: tuple[PermissionSet, ...] = tuple(
+    PermissionSet(view=bool(i & 1), add=bool(i & 2), edit=bool(i & 4), delete=bool(i & 8))
+    for i in range(16)
+)
+
+
+def pset_from_int(bits: int) -> PermissionSet:
+    return _PSET_CACHE[bits & 0xF]
+
+
+def pset_from_flags(flags: Mapping[str, bool]) -> PermissionSet:
+    bits = 0
+    for action, bit in ACTION_BITS.items():
+        if flags.get(action):
+            bits |= bit
+    return _PSET_CACHE[bits]
+
+
+def _coerce_pset(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value  # let validation reject it rather than treat it as a bitmask
+    if isinstance(value, int):
+        return pset_from_int(value)
+    if isinstance(value, PermissionSet):
+        return _PSET_CACHE[pset_to_int(value)]
+    if isinstance(value, Mapping):
+        return pset_from_flags(value)
+    return value
+
+
 class Role(Document):
     key: Indexed(str, unique=True)
     name: str
@@ -28,6 +72,24 @@ class Role(Document):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    # (permissions dict it was built from, {module: bitmask}); rebuilt when permissions is reassigned.
+    _perm_bits: tuple[dict, dict[str, int]] | None = PrivateAttr(default=None)
+
+    def permission_bits(self) -> dict[str, int]:
+        cached = self._perm_bits
+        if cached is None or cached[0] is not self.permissions:
+            cached = (self.permissions, {module: pset_to_int(p) for module, p in self.permissions.items()})
+            self._perm_bits = cached
+        return cached[1]
+
+    @field_validator("permissions", mode="before")
+    @classmethod
+    def coerce_permissions(cls, value: Any) -> Any:
+        # Stored as {module: bitmask}; older documents hold {module: {view: ..., ...}}.
+        if isinstance(value, Mapping):
+            return {module: _coerce_pset(perm) for module, perm in value.items()}
+        return value
+
     @field_validator("permissions")
     @classmethod
     def validate_permissions(cls, value: dict[str, PermissionSet]) -> dict[str, PermissionSet]:
@@ -39,6 +101,7 @@ class Role(Document):
     class Settings:
         name = "roles"
         use_state_management = True
+        bson_encoders = {PermissionSet: pset_to_int}
 
 
 class RolePermissionInput(BaseModel):
@@ -56,14 +119,14 @@ class RolePermissionInput(BaseModel):
         return value
 
 
-class RoleCreateRequest(BaseModel):
+class RoleCreateRequest(RequestModel):
     name: str
     description: str | None = None
     is_active: bool = True
     permissions: list[RolePermissionInput] = Field(default_factory=list)
 
 
-class RoleUpdateRequest(BaseModel):
+class RoleUpdateRequest(RequestModel):
     name: str | None = None
     description: str | None = None
     is_active: bool | None = None
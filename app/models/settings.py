@@ -2,6 +2,8 @@
 from beanie import Document
 from pydantic import BaseModel, Field
 
+from app.models.base import RequestModel
+
 
 class FeeComponent(BaseModel):
     """A single fee line item: name, type; percentage for % type, amount for fixed."""
@@ -47,15 +49,15 @@ class AppSettings(Document):
         use_state_management = True
 
 
-class ClassOptionsUpdate(BaseModel):
+class ClassOptionsUpdate(RequestModel):
     class_options: list[str] = Field(default_factory=list)
 
 
-class FeeStructuresUpdate(BaseModel):
+class FeeStructuresUpdate(RequestModel):
     fee_structures: list[FeeStructureItem] = Field(default_factory=list)
 
 
-class CCTVConfigUpdate(BaseModel):
+class CCTVConfigUpdate(RequestModel):
     cctv_enabled: bool
 
 
@@ -63,6 +65,6 @@ class BannerList(BaseModel):
     banners: list[BannerItem] = Field(default_factory=list)
 
 
-class BannerListUpdate(BaseModel):
+class BannerListUpdate(RequestModel):
     banners: list[BannerItem] = Field(default_factory=list)
     max_banners: int = 5
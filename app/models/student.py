@@ -5,6 +5,8 @@ from typing import Optional
 from beanie import Document, Indexed
 from pydantic import BaseModel, Field
 
+from app.models.base import RequestModel
+
 
 class AttendanceLog(BaseModel):
     date: date
@@ -63,7 +65,7 @@ class Student(Document):
         use_state_management = True
 
 
-class GuardianInfoCreate(BaseModel):
+class GuardianInfoCreate(RequestModel):
     name: str
     relationship: str  # Mother, Father, other
     relationship_other: Optional[str] = None
@@ -71,13 +73,13 @@ class GuardianInfoCreate(BaseModel):
     email: Optional[str] = None
 
 
-class EmergencyContactCreate(BaseModel):
+class EmergencyContactCreate(RequestModel):
     name: str
     relationship: str
     phone: str
 
 
-class StudentCreate(BaseModel):
+class StudentCreate(RequestModel):
     full_name: str
     gender: Optional[str] = None
     date_of_birth: Optional[date] = None
@@ -97,7 +99,7 @@ class StudentCreate(BaseModel):
     emergency_contact: Optional[EmergencyContactCreate] = None
 
 
-class StudentUpdate(BaseModel):
+class StudentUpdate(RequestModel):
     """All fields optional for PATCH; academic_year and admission_number are not updatable."""
     full_name: Optional[str] = None
     photo_url: Optional[str] = None
@@ -6,6 +6,8 @@ from typing import Optional
 from beanie import Document, Indexed
 from pydantic import BaseModel, EmailStr, Field
 
+from app.models.base import RequestModel
+
 
 class UserRole(str, Enum):
     ADMIN = "admin"
@@ -40,9 +42,23 @@ class User(Document):
     class Settings:
         name = "users"
         use_state_management = True
+        # Parent lookups by linked student (FCM fan-out, attendance notices).
+        indexes = ["student_ids"]
+
+
+class UserTokens(BaseModel):
+    """Projection of User carrying only FCM tokens, for notification fan-out."""
+
+    fcm_tokens: list[str] = Field(default_factory=list)
+
+
+class ParentTokens(UserTokens):
+    """FCM tokens plus linked students, for grouping notifications per student."""
+
+    student_ids: list[str] = Field(default_factory=list)
 
 
-class UserCreate(BaseModel):
+class UserCreate(RequestModel):
     email: EmailStr
     password: str
     role: str
@@ -1,6 +1,6 @@
 from datetime import datetime, date
-from app.models.settings import AppSettings
 from app.models.academic_year import AcademicYear
+from app.services.app_settings import get_app_settings
 
 async def ensure_academic_year():
     """
@@ -8,7 +8,7 @@ async def ensure_academic_year():
     Calculates based on AppSettings.academic_year_config.
     Mark only one as current.
     """
-    settings = await AppSettings.find_one()
+    settings = await get_app_settings()
     if not settings:
         # Should not happen as we seed or it's created on first access
         # But let's handle it gracefully
@@ -1,20 +1,45 @@
 """Announcement targeting, visibility, sorting and serialization helpers."""
 from __future__ import annotations
 
-import re
+import asyncio
 from typing import Iterable
 
+try:
+    # Linear-time DFA matching for user-supplied HTML when google-re2 is installed.
+    import re2 as _re
+except ImportError:
+    import re as _re
+
 from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
 
 from app.models.branch import Branch
-from app.models.feed import FeedPost
+from app.models.feed import FeedPost, FeedPostLite
 from app.models.student import Student
 from app.models.user import User
 
-_HTML_TAG_RE = re.compile(r"<[^>]+>")
-_MULTISPACE_RE = re.compile(r"\s+")
-_HTML_IMG_SRC_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
-_IMAGE_URL_RE = re.compile(r"(https?:\/\/\S+\.(?:png|jpg|jpeg|webp|gif))", re.IGNORECASE)
+# Inline (?i) rather than flag arguments so both engines accept the patterns.
+_IMAGE_URL_PATTERN = r"https?://{}+\.(?:png|jpg|jpeg|webp|gif)"
+# One walk over the HTML: <img> tags (with src), bare image URLs in the text,
+# and every other tag. URLs stop at markup, as they would once tags are stripped.
+# Tags cannot contain "<", so a stray "<" in the text never swallows the next tag.
+_HTML_SCAN_RE = _re.compile(
+    r"""(?i)(?P<img><img[^>]+src=["'](?P<src>[^"']+)["'][^>]*>)"""
+    r"|(?P<url>" + _IMAGE_URL_PATTERN.format(r"[^\s<>]") + r")"
+    r"|(?P<tag><[^<>]+>)"
+)
+_MULTISPACE_RE = _re.compile(r"\s+")
+_IMAGE_URL_RE = _re.compile(r"(?i)(" + _IMAGE_URL_PATTERN.format(r"\S") + r")")
+
+
+class _AuthorName(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    full_name: str = ""
+
+
+class _BranchName(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    name: str = ""
 
 
 def safe_object_id(value: str | None) -> PydanticObjectId | None:
@@ -39,17 +64,43 @@ def unique_branch_ids(values: Iterable[str] | None) -> list[str]:
     return result
 
 
+def _scan_html(content_html: str, text: bool = True) -> tuple[str, str | None, str | None]:
+    """Strip tags, and find the first <img> src and first image URL, in one pass.
+
+    With text=False the stripped text is not built (it comes back empty) and
+    the scan stops at the first <img> src.
+    """
+    parts: list[str] = []
+    image_src: str | None = None
+    image_url: str | None = None
+    pos = 0
+    for match in _HTML_SCAN_RE.finditer(content_html):
+        if match.group("url") is not None:
+            # Plain text, not markup: it stays in the output.
+            if image_url is None:
+                image_url = match.group("url")
+            continue
+        if image_src is None and match.group("src"):
+            image_src = match.group("src").strip() or None
+            if image_src and not text:
+                break
+        if text:
+            parts.append(content_html[pos : match.start()])
+            pos = match.end()
+    if not text:
+        return "", image_src, image_url
+    parts.append(content_html[pos:])
+    return _MULTISPACE_RE.sub(" ", " ".join(parts)).strip(), image_src, image_url
+
+
 def plain_text_from_html(content_html: str) -> str:
-    text = _HTML_TAG_RE.sub(" ", content_html or "")
-    return _MULTISPACE_RE.sub(" ", text).strip()
+    return _scan_html(content_html or "")[0]
 
 
-def announcement_target_branch_ids(post: FeedPost) -> list[str]:
-    branch_ids = unique_branch_ids(getattr(post, "target_branch_ids", []) or [])
-    legacy_branch_id = (getattr(post, "branch_id", None) or "").strip()
-    if legacy_branch_id and legacy_branch_id not in branch_ids:
-        branch_ids.append(legacy_branch_id)
-    return branch_ids
+def announcement_target_branch_ids(post: FeedPost | FeedPostLite) -> list[str]:
+    # The legacy branch_id is merged in on every write (FeedPost.merge_legacy_branch)
+    # and by backfill_announcement_targets for older posts.
+    return post.target_branch_ids or []
 
 
 def is_announcement_visible(post: FeedPost, allowed_branch_ids: set[str]) -> bool:
@@ -58,7 +109,7 @@ def is_announcement_visible(post: FeedPost, allowed_branch_ids: set[str]) -> boo
         return True
     if not allowed_branch_ids:
         return False
-    return bool(set(target_ids) & allowed_branch_ids)
+    return any(branch_id in allowed_branch_ids for branch_id in target_ids)
 
 
 async def parent_branch_ids(user: User) -> list[str]:
@@ -80,21 +131,37 @@ async def parent_branch_ids(user: User) -> list[str]:
     return unique_branch_ids([s.branch_id for s in students if s.branch_id])
 
 
-async def list_announcements_for_scope(allowed_branch_ids: set[str] | None) -> list[FeedPost]:
-    posts = await FeedPost.find_all().to_list()
+def _scope_query(allowed_branch_ids: set[str] | None) -> dict:
+    """Mongo equivalent of is_announcement_visible for a set of branch ids."""
     if allowed_branch_ids is None:
-        return posts
-    return [p for p in posts if is_announcement_visible(p, allowed_branch_ids)]
-
-
-def sort_announcements(posts: list[FeedPost]) -> list[FeedPost]:
-    return sorted(
-        posts,
-        key=lambda p: (
-            0 if p.is_pinned else 1,
-            -(p.created_at.timestamp() if p.created_at else 0),
-        ),
-    )
+        return {}
+    # null/[] match posts published to all branches.
+    return {"target_branch_ids": {"$in": [*allowed_branch_ids, None, []]}}
+
+
+async def backfill_announcement_targets() -> int:
+    """Copy legacy branch_id into target_branch_ids for posts written before the merge hook."""
+    modified = 0
+    # One pair of updates per distinct legacy branch; there are only a handful.
+    for branch_id in await FeedPost.distinct("branch_id", {"branch_id": {"$nin": [None, ""]}}):
+        result = await FeedPost.find(
+            {"branch_id": branch_id, "target_branch_ids": None}
+        ).update_many({"$set": {"target_branch_ids": [branch_id]}})
+        modified += result.modified_count
+        result = await FeedPost.find(
+            {"branch_id": branch_id, "target_branch_ids": {"$ne": branch_id}}
+        ).update_many({"$addToSet": {"target_branch_ids": branch_id}})
+        modified += result.modified_count
+    return modified
+
+
+async def list_announcements_for_scope(
+    allowed_branch_ids: set[str] | None,
+) -> list[FeedPostLite]:
+    return await FeedPost.find(
+        _scope_query(allowed_branch_ids),
+        projection_model=FeedPostLite,
+    ).sort([("is_pinned", -1), ("created_at", -1)]).to_list()
 
 
 async def build_author_name_map(posts: list[FeedPost]) -> dict[str, str]:
@@ -112,7 +179,9 @@ async def build_author_name_map(posts: list[FeedPost]) -> dict[str, str]:
     if not author_oids:
         return {}
 
-    users = await User.find({"_id": {"$in": author_oids}}).to_list()
+    users = await User.find(
+        {"_id": {"$in": author_oids}}, projection_model=_AuthorName
+    ).to_list()
     return {str(u.id): u.full_name for u in users}
 
 
@@ -132,29 +201,45 @@ async def build_branch_name_map(posts: list[FeedPost]) -> dict[str, str]:
     if not branch_oids:
         return {}
 
-    branches = await Branch.find({"_id": {"$in": branch_oids}}).to_list()
+    branches = await Branch.find(
+        {"_id": {"$in": branch_oids}}, projection_model=_BranchName
+    ).to_list()
     return {str(b.id): b.name for b in branches}
 
 
+async def build_name_maps(posts: list[FeedPost]) -> tuple[dict[str, str], dict[str, str]]:
+    """Author and branch name maps, fetched concurrently."""
+    author_name_map, branch_name_map = await asyncio.gather(
+        build_author_name_map(posts),
+        build_branch_name_map(posts),
+    )
+    return author_name_map, branch_name_map
+
+
 def serialize_announcement(
     post: FeedPost,
     author_name_map: dict[str, str],
     branch_name_map: dict[str, str],
 ) -> dict:
     target_ids = announcement_target_branch_ids(post)
+    content_html = post.content_html or ""
     plain_content = (post.content or "").strip()
-    if not plain_content and (post.content_html or "").strip():
-        plain_content = plain_text_from_html(post.content_html or "")
 
     image_url = None
-    if (post.content_html or "").strip():
-        img_match = _HTML_IMG_SRC_RE.search(post.content_html or "")
-        if img_match:
-            image_url = (img_match.group(1) or "").strip() or None
+    text_image_url = None
+    text_scanned = False
+    if content_html.strip():
+        # Only the <img> src is needed when the post carries its own plain text.
+        html_text, image_url, html_image_url = _scan_html(content_html, text=not plain_content)
+        if not plain_content:
+            # The plain text is the HTML's text, so the scan already found its URL.
+            plain_content, text_image_url = html_text, html_image_url
+            text_scanned = True
     if not image_url:
-        url_match = _IMAGE_URL_RE.search(plain_content)
-        if url_match:
-            image_url = (url_match.group(1) or "").strip() or None
+        if not text_scanned:
+            url_match = _IMAGE_URL_RE.search(plain_content)
+            text_image_url = url_match.group(1) if url_match else None
+        image_url = (text_image_url or "").strip() or None
 
     return {
         "id": str(post.id),
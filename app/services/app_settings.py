@@ -0,0 +1,22 @@
+"""Cached access to the single AppSettings document."""
+from __future__ import annotations
+
+from app.models.settings import AppSettings
+from app.services.cache import TTLCache
+
+_SETTINGS_KEY = "settings:main"
+_settings_cache = TTLCache(ttl=60, maxsize=8)
+
+
+async def get_app_settings() -> AppSettings | None:
+    """Return AppSettings for read-only use; writers should load their own copy."""
+    settings = _settings_cache.get(_SETTINGS_KEY)
+    if settings is None:
+        settings = await AppSettings.find_one()
+        if settings is not None:
+            _settings_cache.set(_SETTINGS_KEY, settings)
+    return settings
+
+
+def invalidate_app_settings() -> None:
+    _settings_cache.delete(_SETTINGS_KEY)
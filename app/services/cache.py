@@ -0,0 +1,40 @@
+"""Small in-process TTL cache for read-mostly documents (settings, roles)."""
+from __future__ import annotations
+
+import time
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Dict-backed cache whose entries expire `ttl` seconds after being set.
+
+    Values are per-process, so writers must call `delete`/`clear` after saving;
+    other workers pick up the change once their entry expires.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if key not in self._data and len(self._data) >= self.maxsize:
+            # Drop the oldest insertion; dicts keep insertion order.
+            self._data.pop(next(iter(self._data)), None)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -2,20 +2,27 @@
 import hashlib
 import hmac
 import time
+from functools import lru_cache
 from urllib.parse import urlencode
 
 from app.models.branch import CCTVConfig
 
 
+@lru_cache(maxsize=256)
+def _hmac_prototype(secret: bytes) -> hmac.HMAC:
+    """Keyed HMAC state per secret; callers .copy() it instead of re-keying."""
+    return hmac.new(secret, None, hashlib.sha256)
+
+
 def generate_signed_stream_url(config: CCTVConfig, *, student_id: str, expires_in: int = 3600) -> str:
     """Generate time-limited signed URL for HLS stream (IP/Token restriction)."""
     expiry = int(time.time()) + expires_in
     payload = f"{config.stream_id}:{student_id}:{expiry}"
-    sig = hmac.new(
-        config.token_secret.encode(),
-        payload.encode(),
-        hashlib.sha256,
-    ).hexdigest()
+    # Copying the keyed prototype skips the key padding and inner/outer pad
+    # hashing that every fresh HMAC repeats.
+    mac = _hmac_prototype(config.token_secret_bytes).copy()
+    mac.update(payload.encode())
+    sig = mac.hexdigest()
     params = {"token": sig, "expires": expiry, "student_id": student_id}
     base = config.hls_playlist_url.rstrip("/")
     return f"{base}?{urlencode(params)}"
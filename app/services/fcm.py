@@ -1,25 +1,34 @@
 """Firebase Cloud Messaging: feed announcements and attendance notifications."""
+import asyncio
+
 import firebase_admin
 from firebase_admin import credentials, messaging
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 import logging
 
 from app.models.feed import FeedPost
 from app.models.student import Student, AttendanceLog
-from app.models.user import User, UserRole
+from app.models.user import ParentTokens, User, UserRole, UserTokens
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 _firebase_app = None
+# Fixed for the life of the process; checked before any Firebase setup work.
+_FCM_ENABLED = bool(settings.firebase_credentials_path)
+if not _FCM_ENABLED:
+    logger.warning("FIREBASE_CREDENTIALS_PATH not set. FCM will be disabled.")
+# FCM multicast accepts at most 500 tokens per call.
+_FCM_BATCH_SIZE = 500
+# Concurrent multicast calls per send, to stay within FCM's request rate.
+_FCM_MAX_IN_FLIGHT = 8
 
 def _get_firebase_app():
     global _firebase_app
     if _firebase_app is not None:
         return _firebase_app
     
-    if not settings.firebase_credentials_path:
-        logger.warning("FIREBASE_CREDENTIALS_PATH not set. FCM will be disabled.")
+    if not _FCM_ENABLED:
         return None
     
     try:
@@ -30,99 +39,153 @@ def _get_firebase_app():
         logger.error(f"Failed to initialize Firebase app: {e}")
         return None
 
+def _branch_parents_pipeline(branch_ids: list[str]) -> list[dict]:
+    """Students in the branches -> their parents' FCM tokens, in one round-trip.
+
+    User.student_ids holds string ids, so the student _id is stringified before
+    the lookup; the localField/foreignField form keeps it on the student_ids index.
+    """
+    return [
+        {"$match": {"branch_id": {"$in": branch_ids}}},
+        {"$project": {"_id": 0, "sid": {"$toString": "$_id"}}},
+        {
+            "$lookup": {
+                "from": User.get_collection_name(),
+                "localField": "sid",
+                "foreignField": "student_ids",
+                "pipeline": [
+                    {"$match": {"role": UserRole.PARENT.value}},
+                    {"$project": {"fcm_tokens": 1}},
+                ],
+                "as": "parents",
+            }
+        },
+        {"$unwind": "$parents"},
+        # A parent with several children in scope is only notified once.
+        {"$group": {"_id": "$parents._id", "fcm_tokens": {"$first": "$parents.fcm_tokens"}}},
+    ]
+
+
+async def _token_batches(
+    token_lists: AsyncIterator[Optional[List[str]]],
+) -> AsyncIterator[List[str]]:
+    """Regroup streamed per-parent token lists into FCM-sized batches."""
+    buf: List[str] = []
+    async for tokens in token_lists:
+        if tokens:
+            buf.extend(tokens)
+        while len(buf) >= _FCM_BATCH_SIZE:
+            yield buf[:_FCM_BATCH_SIZE]
+            del buf[:_FCM_BATCH_SIZE]
+    if buf:
+        yield buf
+
+
+async def _send_multicast(messages: AsyncIterator[messaging.MulticastMessage]) -> list:
+    """Send each message on a worker thread, at most _FCM_MAX_IN_FLIGHT at once.
+
+    The blocking Admin SDK call runs off the event loop; acquiring the semaphore
+    before pulling the next message also throttles the upstream token cursor.
+    Returns responses or exceptions in message order.
+    """
+    semaphore = asyncio.Semaphore(_FCM_MAX_IN_FLIGHT)
+
+    async def send(message: messaging.MulticastMessage):
+        try:
+            return await asyncio.to_thread(messaging.send_each_for_multicast, message)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    async for message in messages:
+        await semaphore.acquire()
+        tasks.append(asyncio.create_task(send(message)))
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _feed_recipient_tokens(post: FeedPost) -> AsyncIterator[Optional[List[str]]]:
+    # If not publish_to_all, only parents with a student in the target branches
+    branch_ids = post.target_branch_ids or ([post.branch_id] if post.branch_id else [])
+    if branch_ids:
+        async for parent in Student.aggregate(_branch_parents_pipeline(branch_ids)):
+            yield parent.get("fcm_tokens")
+    else:
+        async for parent in User.find(
+            {"role": UserRole.PARENT.value}, projection_model=UserTokens
+        ):
+            yield parent.fcm_tokens
+
+
+
 async def send_feed_push(post: FeedPost) -> None:
     """Send FCM to relevant parents when a new announcement is posted."""
     app = _get_firebase_app()
     if not app:
         return
 
-    # 1. Identify target parents
-    query = {"role": UserRole.PARENT.value}
-    
-    # If not publish_to_all, filter by branch
-    if post.target_branch_ids:
-        # Get all parents who have at least one student in the target branches
-        # This is a bit complex since student_ids are strings in User.
-        # We'll first find students in those branches.
-        students = await Student.find({"branch_id": {"$in": post.target_branch_ids}}).to_list()
-        student_ids = [str(s.id) for s in students]
-        query["student_ids"] = {"$in": student_ids}
-    elif post.branch_id:
-        students = await Student.find({"branch_id": post.branch_id}).to_list()
-        student_ids = [str(s.id) for s in students]
-        query["student_ids"] = {"$in": student_ids}
-
-    parents = await User.find(query).to_list()
-    
-    # 2. Collect FCM tokens
-    tokens = []
-    for parent in parents:
-        if parent.fcm_tokens:
-            tokens.extend(parent.fcm_tokens)
-    
-    if not tokens:
-        return
+    title = f"Update: {post.title}" if post.revision > 1 else post.title
 
-    # Check if this is an update (updated_at > created_at + 5 seconds buffer)
-    is_update = (post.updated_at - post.created_at).total_seconds() > 5
-    title = f"Update: {post.title}" if is_update else post.title
-
-    # 3. Send notification
-    # Batch send limit is 500
-    for i in range(0, len(tokens), 500):
-        batch = tokens[i:i+500]
-        message = messaging.MulticastMessage(
-            notification=messaging.Notification(
-                title=title,
-                body=post.content[:100] + "..." if len(post.content) > 100 else post.content,
-            ),
+    # Tokens are streamed from the parents cursor and sent as each batch fills,
+    # so only the in-flight batches are held in memory.
+    body = post.content[:100] + "..." if len(post.content) > 100 else post.content
+    results = await _send_multicast(
+        messaging.MulticastMessage(
+            notification=messaging.Notification(title=title, body=body),
             data={
                 "type": "announcement",
                 "id": str(post.id),
             },
             tokens=batch,
         )
-        try:
-            response = messaging.send_each_for_multicast(message)
-            logger.info(f"Sent announcement notification to {response.success_count} devices. Errors: {response.failure_count}")
-        except Exception as e:
-            logger.error(f"FCM batch send failed: {e}")
+        async for batch in _token_batches(_feed_recipient_tokens(post))
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error(f"FCM batch send failed: {result}")
+        else:
+            logger.info(f"Sent announcement notification to {result.success_count} devices. Errors: {result.failure_count}")
+
+async def _attendance_messages(
+    pairs: dict[str, tuple[Student, AttendanceLog]],
+    tokens_by_student: dict[str, List[str]],
+) -> AsyncIterator[messaging.MulticastMessage]:
+    for student_id, tokens in tokens_by_student.items():
+        student, log = pairs[student_id]
+        status_text = "Present" if log.status == "present" else "Absent"
+        title = f"Attendance: {student.full_name}"
+        body = f"{student.full_name} has been marked {status_text} for {log.date.strftime('%d %b %Y')}."
+        for i in range(0, len(tokens), _FCM_BATCH_SIZE):
+            yield messaging.MulticastMessage(
+                notification=messaging.Notification(title=title, body=body),
+                data={
+                    "type": "attendance",
+                    "student_id": student_id,
+                },
+                tokens=tokens[i : i + _FCM_BATCH_SIZE],
+            )
 
-async def send_attendance_notification(student: Student, log: AttendanceLog) -> None:
-    """Notify parent of attendance update via FCM."""
+
+async def send_attendance_notifications(pairs: List[tuple[Student, AttendanceLog]]) -> None:
+    """Notify parents of several students' attendance with a single parent lookup."""
     app = _get_firebase_app()
-    if not app:
+    if not app or not pairs:
         return
 
-    # Find parent(s) for this student
-    parents = await User.find({"role": UserRole.PARENT.value, "student_ids": str(student.id)}).to_list()
-    
-    tokens = []
-    for parent in parents:
-        if parent.fcm_tokens:
-            tokens.extend(parent.fcm_tokens)
-            
-    if not tokens:
-        return
+    by_student = {str(student.id): (student, log) for student, log in pairs}
+    tokens_by_student: dict[str, List[str]] = {student_id: [] for student_id in by_student}
+    async for parent in User.find(
+        {"role": UserRole.PARENT.value, "student_ids": {"$in": list(by_student)}},
+        projection_model=ParentTokens,
+    ):
+        if not parent.fcm_tokens:
+            continue
+        # A parent linked to several of these students gets one notice per child.
+        for student_id in parent.student_ids:
+            bucket = tokens_by_student.get(student_id)
+            if bucket is not None:
+                bucket.extend(parent.fcm_tokens)
 
-    status_text = "Present" if log.status == "present" else "Absent"
-    title = f"Attendance: {student.full_name}"
-    body = f"{student.full_name} has been marked {status_text} for {log.date.strftime('%d %b %Y')}."
-
-    for i in range(0, len(tokens), 500):
-        batch = tokens[i:i+500]
-        message = messaging.MulticastMessage(
-            notification=messaging.Notification(
-                title=title,
-                body=body,
-            ),
-            data={
-                "type": "attendance",
-                "student_id": str(student.id),
-            },
-            tokens=batch,
-        )
-        try:
-            messaging.send_each_for_multicast(message)
-        except Exception as e:
-            logger.error(f"FCM attendance notification failed: {e}")
+    results = await _send_multicast(_attendance_messages(by_student, tokens_by_student))
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error(f"FCM attendance notification failed: {result}")
@@ -1,17 +1,58 @@
 """Receipt PDF generation (ReportLab primary, WeasyPrint fallback); A5, minimal layout."""
+import asyncio
 import io
 import logging
-import uuid
+import multiprocessing
+import os
+import secrets
+import textwrap
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from app.config import settings
 from app.models.billing import Billing
-from app.services.s3 import upload_receipt_to_s3
+from app.services.cache import TTLCache
+from app.services.s3 import bulk_upload_receipts, upload_receipt_to_s3
 
 logger = logging.getLogger(__name__)
 
+try:
+    from reportlab.lib import colors as _rl_colors
+    from reportlab.lib.pagesizes import A5
+    from reportlab.lib.units import mm
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.pdfgen import canvas
+    from reportlab.platypus import Table, TableStyle
+
+    _REPORTLAB_AVAILABLE = True
+    _BORDER_COLOR = _rl_colors.HexColor("#707070")
+    _HEADER_FILL = _rl_colors.HexColor("#e0e0e0")
+    _RECEIPT_TABLE_STYLE = TableStyle(
+        [
+            ("GRID", (0, 0), (-1, -1), 0.5, _BORDER_COLOR),
+            ("BOX", (0, 0), (-1, -1), 0.75, _BORDER_COLOR),
+            ("BACKGROUND", (0, 0), (-1, 0), _HEADER_FILL),
+            ("ALIGN", (1, 1), (1, -1), "RIGHT"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+        ]
+    )
+    # Fixed strings: measure once instead of on every receipt.
+    _LABEL_WIDTHS = {
+        "admission_number": stringWidth("Admission Number: ", "Helvetica-Bold", 10),
+        "class": stringWidth("Class: ", "Helvetica-Bold", 10),
+    }
+    _TITLE = "RECEIPT OF PAYMENT"
+    _TITLE_W = stringWidth(_TITLE, "Helvetica-Bold", 16)
+except ImportError:
+    _REPORTLAB_AVAILABLE = False
+
 # Base directory for resolving relative /static/ paths
 _BASE_DIR = Path(__file__).resolve().parent.parent.parent  # backend/
 
@@ -19,7 +60,6 @@ _BASE_DIR = Path(__file__).resolve().parent.parent.parent  # backend/
 def _load_image(url_or_path: str):
     """Load an image from a local /static/ path or a remote URL.
     Returns an ImageReader or None on failure."""
-    from reportlab.lib.utils import ImageReader
     try:
         if url_or_path.startswith("/static/"):
             local_path = _BASE_DIR / url_or_path.lstrip("/")
@@ -36,66 +76,198 @@ def _load_image(url_or_path: str):
         logger.warning("Failed to load image %s: %s", url_or_path, e)
         return None
 
+# Logos rarely change; keep the ImageReader per URL for an hour. The reader
+# holds on to its decoded pixels after the first drawImage, so later receipts
+# skip the decode. Only a few distinct logos exist, so keep the cache small.
+_logo_cache = TTLCache(ttl=3600, maxsize=16)
+
+
+def _fetch_logo(url_or_path: str):
+    """Cached _load_image; failures are not cached so the next receipt retries."""
+    img = _logo_cache.get(url_or_path)
+    if img is None:
+        img = _load_image(url_or_path)
+        if img is not None:
+            _logo_cache.set(url_or_path, img)
+    return img
+
 # Receipt context (student/branch info for header)
 ReceiptContext = Optional[dict]  # student_name, class_name, branch_name
 
-
-def _number_to_words_indian(n: float) -> str:
-    """Convert number to words (Indian style). E.g. 52000 -> 'Rupees Fifty Two Thousand Only'."""
-    n = int(round(n))
+# ReportLab drawing is pure-Python CPU work; render in worker processes so it
+# neither blocks the event loop nor holds the GIL other requests need. Each
+# app worker gets its own pool, so keep it small (settings.receipt_pdf_workers).
+_pdf_pool: ProcessPoolExecutor | None = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        with _pdf_pool_lock:
+            if _pdf_pool is None:
+                # spawn, not fork: the parent runs an event loop and client threads.
+                _pdf_pool = ProcessPoolExecutor(
+                    max_workers=max(1, settings.receipt_pdf_workers),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pdf_pool
+
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next render starts a fresh one."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pdf_pool() -> None:
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+async def _render_pdf(
+    billing: Billing, context: ReceiptContext = None, now: datetime | None = None
+) -> bytes | None:
+    loop = asyncio.get_running_loop()
+    payload = _billing_payload(billing, now)
+    for attempt in range(2):
+        pool = _get_pdf_pool()
+        try:
+            return await loop.run_in_executor(pool, _reportlab_pdf_bytes_from_dict, payload, context)
+        except BrokenProcessPool as e:
+            # A worker died (crash, OOM kill); the executor rejects all work from now on.
+            _discard_pdf_pool(pool)
+            logger.warning("ReportLab PDF pool broken (%s); %s", e, "retrying" if attempt == 0 else "giving up")
+        except Exception as e:
+            logger.warning("ReportLab PDF worker failed: %s", e)
+            return None
+    return None
+
+
+_ONES = ("", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine")
+_TENS = ("", "", "Twenty", "Thirty", "Forty", "Fifty", "Sixty", "Seventy", "Eighty", "Ninety")
+_TEENS = ("Ten", "Eleven", "Twelve", "Thirteen", "Fourteen", "Fifteen", "Sixteen", "Seventeen", "Eighteen", "Nineteen")
+
+
+def _append_below_1000(x: int, parts: list[str]) -> None:
+    h, r = divmod(x, 100)
+    if h:
+        parts.append(_ONES[h])
+        parts.append("Hundred")
+    if r >= 20:
+        t, o = divmod(r, 10)
+        parts.append(_TENS[t])
+        if o:
+            parts.append(_ONES[o])
+    elif r >= 10:
+        parts.append(_TEENS[r - 10])
+    elif r:
+        parts.append(_ONES[r])
+
+
+def _append_indian(n: int, parts: list[str]) -> None:
+    """Words for n using Indian grouping: crore, lakh, thousand, hundreds."""
+    crore, rest = divmod(n, 100_000_00)
+    if crore:
+        _append_indian(crore, parts)
+        parts.append("Crore")
+    lakh, rest = divmod(rest, 100_000)
+    if lakh:
+        _append_below_1000(lakh, parts)
+        parts.append("Lakh")
+    thousand, rest = divmod(rest, 1000)
+    if thousand:
+        _append_below_1000(thousand, parts)
+        parts.append("Thousand")
+    if rest:
+        _append_below_1000(rest, parts)
+
+
+@lru_cache(maxsize=1024)
+def _rupees_in_words(n: int) -> str:
     if n == 0:
         return "Rupees Zero Only"
-    ones = ["", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine"]
-    tens = ["", "", "Twenty", "Thirty", "Forty", "Fifty", "Sixty", "Seventy", "Eighty", "Ninety"]
-    teens = ["Ten", "Eleven", "Twelve", "Thirteen", "Fourteen", "Fifteen", "Sixteen", "Seventeen", "Eighteen", "Nineteen"]
-
-    def up_to_99(x: int) -> str:
-        if x < 10:
-            return ones[x]
-        if x < 20:
-            return teens[x - 10]
-        t, o = divmod(x, 10)
-        return (tens[t] + " " + ones[o]).strip()
-
-    def up_to_999(x: int) -> str:
-        if x < 100:
-            return up_to_99(x)
-        h, r = divmod(x, 100)
-        return (ones[h] + " Hundred " + up_to_99(r)).strip() if r else (ones[h] + " Hundred").strip()
-
-    def up_to_lakh(x: int) -> str:
-        if x < 1000:
-            return up_to_999(x)
-        q, r = divmod(x, 1000)
-        return (up_to_999(q) + " Thousand " + up_to_999(r)).strip() if r else (up_to_999(q) + " Thousand").strip()
-
     if n < 0:
         return "Rupees (Negative) Only"
-    if n >= 100_000_00:  # 1 crore+
-        c, r = divmod(n, 100_000_00)
-        return ("Rupees " + up_to_lakh(c) + " Crore " + up_to_lakh(r) + " Only").strip()
-    if n >= 100_000:  # 1 lakh+
-        l, r = divmod(n, 100_000)
-        return ("Rupees " + up_to_lakh(l) + " Lakh " + up_to_lakh(r) + " Only").strip()
-    return "Rupees " + up_to_lakh(n) + " Only"
+    parts: list[str] = []
+    _append_indian(n, parts)
+    return "Rupees " + " ".join(parts) + " Only"
+
+
+def _number_to_words_indian(n: float) -> str:
+    """Convert number to words (Indian style). E.g. 52000 -> 'Rupees Fifty Two Thousand Only'."""
+    return _rupees_in_words(int(round(n)))
+
+
+@lru_cache(maxsize=None)
+def _weasyprint_html():
+    """WeasyPrint's HTML class, or None when it (or its native libs) is missing.
+
+    Probed lazily and once: the PDF pool workers import this module and never
+    need WeasyPrint, so it is not imported at module level.
+    """
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError):
+        return None
+    return HTML
 
 
 async def generate_receipt_pdf_bytes(billing: Billing, context: ReceiptContext = None) -> bytes | None:
     """Generate PDF receipt bytes (A5, minimal). context: student_name, class_name, branch_name."""
-    pdf = _reportlab_pdf_bytes(billing, context)
+    pdf = await _render_pdf(billing, context)
     if pdf:
         return pdf
+    HTML = _weasyprint_html()
+    if HTML is None:
+        return None
     try:
-        from weasyprint import HTML
         html = _receipt_html(billing)
         return HTML(string=html).write_pdf()
-    except (ImportError, OSError, Exception):
+    except Exception as e:
+        logger.warning("WeasyPrint PDF failed: %s", e)
         return None
 
 
-def _reportlab_pdf_bytes(billing: Billing, context: ReceiptContext = None) -> bytes | None:
+@lru_cache(maxsize=2048)
+def _fmt_date(dt: datetime, fmt: str) -> str:
+    return dt.strftime(fmt)
+
+
+def _billing_payload(billing: Billing, now: datetime | None = None) -> dict:
+    """The Billing fields the ReportLab layout reads, as a picklable dict for the PDF pool.
+
+    Unpaid billings are stamped with ``now``; bulk callers pass one shared value.
+    """
+    return {
+        "id": str(billing.id or ""),
+        "paid_at": billing.paid_at or now or datetime.utcnow(),
+        "amount_paid": billing.amount_paid,
+        "fee_structure_name": billing.fee_structure.name,
+        "payment_mode": billing.payment_mode,
+        "transaction_number": billing.transaction_number,
+    }
+
+
+def _draw_texts(c, font: str, size: float, items: list[tuple[float, float, str]]) -> None:
+    """Emit several (x, y, text) strings in one font as a single text object."""
+    t = c.beginText()
+    t.setFont(font, size)
+    for x, y, text in items:
+        t.setTextOrigin(x, y)
+        t.textOut(text)
+    c.drawText(t)
+
+
+def _reportlab_pdf_bytes_from_dict(billing: dict, context: ReceiptContext = None) -> bytes | None:
     """
     Build receipt PDF using ReportLab, matching the provided design.
+    `billing` is a _billing_payload dict so this can run in a worker process.
 
     Layout (A5 portrait, approximated to 100% of the sample):
       - Top: school logo (or name) on left, "Receipt #" and "Date" on right.
@@ -107,329 +279,330 @@ def _reportlab_pdf_bytes(billing: Billing, context: ReceiptContext = None) -> by
       - Notes / Authorised Signatory row (two columns).
       - Footer: school name / address.
     """
-    try:
-        from reportlab.lib.pagesizes import A5
-        from reportlab.lib.units import mm
-        from reportlab.pdfgen import canvas
-    except ImportError:
+    if not _REPORTLAB_AVAILABLE:
         return None
-    try:
-        buf = io.BytesIO()
-        c = canvas.Canvas(buf, pagesize=A5)
-        w, h = A5
-        # Page margin: 6mm on all sides (as requested)
-        margin_x = 6 * mm
-        margin_y = 6 * mm
-        y = h - margin_y
-        line_h = 6 * mm
-        small_h = 4 * mm
-
-        school_name = (settings.school_name or settings.app_name).strip()
-        school_address = (settings.school_address or "").strip()
-        logo_url = (settings.school_logo_url or "").strip()
-        trust_logo_url = (getattr(settings, "trust_logo_url", "") or "").strip()
-        trust_address = (getattr(settings, "trust_address", "") or "").strip()
-
-        # Use consistent border color for all drawn borders/lines
-        from reportlab.lib import colors as _rl_colors
-        border_color = _rl_colors.HexColor("#707070")
-        c.setStrokeColor(border_color)
-
-        # === Header: Logo / school name, address, receipt box ===
-        header_top = y
-        if logo_url:
-            try:
-                img = _load_image(logo_url)
-                if img is None:
-                    raise ValueError("Could not load school logo")
-                iw, ih = img.getSize()
-                max_h = 18 * mm
-                max_w = 60 * mm
-                scale = min(max_h / ih, max_w / iw)
-                logo_h = ih * scale
-                logo_w = iw * scale
-                # Small inset from top/left inside header band
-                logo_x = margin_x + 2 * mm
-                logo_y = y - 2 * mm
-                c.drawImage(
-                    img,
-                    logo_x,
-                    logo_y - logo_h,
-                    width=logo_w,
-                    height=logo_h,
-                    preserveAspectRatio=True,
-                    mask="auto",
-                )
-                y_top = y
-                y = y_top - logo_h - 6 * mm
-            except Exception as e:
-                logger.debug("Logo load failed, using school name: %s", e)
-                c.setFont("Helvetica-Bold", 16)
-                c.drawString(margin_x, y, school_name[:60])
-                y -= line_h
-        else:
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=A5)
+    w, h = A5
+    # Page margin: 6mm on all sides (as requested)
+    margin_x = 6 * mm
+    margin_y = 6 * mm
+    y = h - margin_y
+    line_h = 6 * mm
+    small_h = 4 * mm
+
+    school_name = (settings.school_name or settings.app_name).strip()
+    school_address = (settings.school_address or "").strip()
+    logo_url = (settings.school_logo_url or "").strip()
+    trust_logo_url = (getattr(settings, "trust_logo_url", "") or "").strip()
+    trust_address = (getattr(settings, "trust_address", "") or "").strip()
+
+    # Use consistent border color for all drawn borders/lines
+    c.setStrokeColor(_BORDER_COLOR)
+    # All boxes and dividers share one 0.5pt stroke, so they are collected
+    # into a single path and stroked once at the end.
+    frame = c.beginPath()
+
+    # === Header: Logo / school name, address, receipt box ===
+    header_top = y
+    if logo_url:
+        try:
+            img = _fetch_logo(logo_url)
+            if img is None:
+                raise ValueError("Could not load school logo")
+            iw, ih = img.getSize()
+            max_h = 18 * mm
+            max_w = 60 * mm
+            scale = min(max_h / ih, max_w / iw)
+            logo_h = ih * scale
+            logo_w = iw * scale
+            # Small inset from top/left inside header band
+            logo_x = margin_x + 2 * mm
+            logo_y = y - 2 * mm
+            c.drawImage(
+                img,
+                logo_x,
+                logo_y - logo_h,
+                width=logo_w,
+                height=logo_h,
+                preserveAspectRatio=True,
+                mask="auto",
+            )
+            y_top = y
+            y = y_top - logo_h - 6 * mm
+        except Exception as e:
+            logger.debug("Logo load failed, using school name: %s", e)
             c.setFont("Helvetica-Bold", 16)
-            c.drawString(margin_x + 2 * mm, y - 2 * mm, school_name[:60])
-            y -= line_h + 2 * mm
-
-        # Header right: Receipt # and Date (boxed)
-        paid_at = billing.paid_at or datetime.utcnow()
-        date_str = paid_at.strftime("%d/%m/%Y") if hasattr(paid_at, "strftime") else str(paid_at)
-        receipt_no = str(getattr(billing, "id", ""))[-3:] or "-"
-        box_w = 55 * mm
-        box_h = 14 * mm
-        box_x = w - margin_x - box_w
-        box_y = (h - margin_y) - (logo_h if logo_url else 0) - 2 * mm
-        c.setFont("Helvetica", 9)
-        # Rectangle for Receipt # row, aligned with top header border
-        c.setLineWidth(0.5)
-        receipt_box_height = box_h / 2
-        receipt_top = header_top
-        receipt_bottom = receipt_top - receipt_box_height
-        c.rect(box_x, receipt_bottom, box_w, receipt_box_height, stroke=1, fill=0)
-        # Vertically center text in that rectangle
-        baseline_receipt = (receipt_top + receipt_bottom) / 2 - 1.2 * mm
-        c.drawString(box_x + 2 * mm, baseline_receipt, "Receipt #")
-        c.drawRightString(box_x + box_w - 2 * mm, baseline_receipt, receipt_no)
-        # Date row just below, with same style rectangle
-        date_top = receipt_bottom
-        date_bottom = date_top - receipt_box_height
-        c.rect(box_x, date_bottom, box_w, receipt_box_height, stroke=1, fill=0)
-        baseline_date = (date_top + date_bottom) / 2 - 1.2 * mm
-        c.drawString(box_x + 2 * mm, baseline_date, "Date")
-        c.drawRightString(box_x + box_w - 2 * mm, baseline_date, date_str)
-
-        # Vertical divider between label and value for both rows
-        col_x = box_x + box_w * 0.5
-        c.line(col_x, header_top, col_x, header_top - 2 * receipt_box_height)
-
-        # Address (under logo/name)
-        header_bottom = y  # after address (or logo if no address)
-        if school_address:
-            c.setFont("Helvetica", 9)
-            addr_line = school_address.replace("\n", " ").strip()[:110]
-            if addr_line:
-                c.drawString(margin_x + 2 * mm, y - 1 * mm, addr_line)
-                y -= small_h
-            y -= 3 * mm
-
-        # Outer border around logo + address + receipt/date block
-        header_bottom = min(header_bottom, y)
-        c.rect(margin_x, header_bottom, w - 2 * margin_x, header_top - header_bottom, stroke=1, fill=0)
-
-        # === Student details rows (bordered, aligned) ===
-        if context:
-            c.setFont("Helvetica", 10)
-
-            # Row 1: Name of the Student (full-width box)
-            row1_height = 8 * mm
-            row1_top = y
-            row1_bottom = row1_top - row1_height
-            # Vertically center baseline in the row for ~10pt text
-            baseline1 = (row1_top + row1_bottom) / 2 - 1.8 * mm
-            if context.get("student_name"):
-                c.setFont("Helvetica-Bold", 10)
-                c.drawString(margin_x + 2 * mm, baseline1, "Name of the Student : ")
-                c.setFont("Helvetica", 10)
-                c.drawString(margin_x + 40 * mm, baseline1, str(context["student_name"])[:60])
-            # Border for row 1
-            c.setLineWidth(0.5)
-            c.rect(margin_x, row1_bottom, w - 2 * margin_x, row1_height, stroke=1, fill=0)
-
-            # Row 2: Admission Number | Class (two columns with borders)
-            row2_height = 8 * mm
-            row2_top = row1_bottom
-            row2_bottom = row2_top - row2_height
-            baseline2 = (row2_top + row2_bottom) / 2 - 1.8 * mm
-
-            adm = str(context.get("admission_number", "")) if context.get("admission_number") else ""
-            cls = str(context.get("class_name", "")) if context.get("class_name") else ""
-
-            # Column boundary (middle of the row)
-            col_class_x = margin_x + (w - 2 * margin_x) / 2
-
-            # Admission Number (left cell)
-            c.setFont("Helvetica-Bold", 10)
-            c.drawString(margin_x + 2 * mm, baseline2, "Admission Number:")
-            c.setFont("Helvetica", 10)
-            c.drawString(margin_x + 2 * mm + c.stringWidth("Admission Number: ", "Helvetica-Bold", 10), baseline2, adm[:20])
-
-            # Class (right cell)
-            if cls:
-                c.setFont("Helvetica-Bold", 10)
-                c.drawString(col_class_x + 2 * mm, baseline2, "Class:")
-                c.setFont("Helvetica", 10)
-                c.drawString(col_class_x + 2 * mm + c.stringWidth("Class: ", "Helvetica-Bold", 10), baseline2, cls[:20])
-
-            # Outer box and column separator for row 2
-            c.rect(margin_x, row2_bottom, w - 2 * margin_x, row2_height, stroke=1, fill=0)
-            c.line(col_class_x, row2_bottom, col_class_x, row2_top)
-
-            y = row2_bottom - 8 * mm
-
-        # === Title ===
+            c.drawString(margin_x, y, school_name[:60])
+            y -= line_h
+    else:
         c.setFont("Helvetica-Bold", 16)
-        title = "RECEIPT OF PAYMENT"
-        title_w = c.stringWidth(title, "Helvetica-Bold", 16)
-        c.drawString((w - title_w) / 2, y, title)
-        # Slight spacing below title (tighter than before)
-        y -= line_h * 0.8
-
-        # Horizontal line above table
-
-
-        # === Components table: header + rows + total (with full borders) ===
-        from reportlab.platypus import Table, TableStyle
-
-        receipt_total = float(billing.amount_paid or 0)
-        components = (context or {}).get("components")
-        data = []
-        if isinstance(components, list) and len(components) > 0:
-            total_amt = sum(float(amt or 0) for _, amt in components)
-            receipt_total = total_amt
-            data.append(["Fee Structure", "Amount"])
-            for name, amt in components:
-                data.append([name or "", f"Rs.{float(amt or 0):,.2f}"])
-        else:
-            data.append(["Fee Structure", "Amount"])
-            data.append([billing.fee_structure.name, f"Rs.{billing.amount_paid:,.2f}"])
-
-        # Total row
-        data.append(["Total", f"Rs.{receipt_total:,.2f}"])
-
-        table_width = w - 2 * margin_x
-        col_widths = [table_width * 0.7, table_width * 0.3]
-        table = Table(data, colWidths=col_widths)
-        style = TableStyle(
-            [
-                ("GRID", (0, 0), (-1, -1), 0.5, border_color),
-                ("BOX", (0, 0), (-1, -1), 0.75, border_color),
-                ("BACKGROUND", (0, 0), (-1, 0), _rl_colors.HexColor("#e0e0e0")),
-                ("ALIGN", (1, 1), (1, -1), "RIGHT"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
-            ]
-        )
-        table.setStyle(style)
-        tw, th = table.wrapOn(c, table_width, h)
-        table.drawOn(c, margin_x, y - th)
-        y -= th + 4 * mm
-
-        # === Amount in words ===
-        c.setFont("Helvetica", 9)
-        words = _number_to_words_indian(receipt_total)
-        max_w = w - 2 * margin_x
-        for i in range(0, len(words), 50):
-            chunk = words[i : i + 50]
-            c.drawString(margin_x, y, chunk)
+        c.drawString(margin_x + 2 * mm, y - 2 * mm, school_name[:60])
+        y -= line_h + 2 * mm
+
+    # Header right: Receipt # and Date (boxed)
+    paid_at = billing["paid_at"]
+    date_str = _fmt_date(paid_at, "%d/%m/%Y") if isinstance(paid_at, datetime) else str(paid_at)
+    receipt_no = billing["id"][-3:] or "-"
+    box_w = 55 * mm
+    box_h = 14 * mm
+    box_x = w - margin_x - box_w
+    # Rectangle for Receipt # row, aligned with top header border
+    receipt_box_height = box_h / 2
+    receipt_top = header_top
+    receipt_bottom = receipt_top - receipt_box_height
+    frame.rect(box_x, receipt_bottom, box_w, receipt_box_height)
+    # Vertically center text in that rectangle
+    baseline_receipt = (receipt_top + receipt_bottom) / 2 - 1.2 * mm
+    # Date row just below, with same style rectangle
+    date_top = receipt_bottom
+    date_bottom = date_top - receipt_box_height
+    frame.rect(box_x, date_bottom, box_w, receipt_box_height)
+    baseline_date = (date_top + date_bottom) / 2 - 1.2 * mm
+    value_right = box_x + box_w - 2 * mm
+    header_texts = [
+        (box_x + 2 * mm, baseline_receipt, "Receipt #"),
+        (value_right - c.stringWidth(receipt_no, "Helvetica", 9), baseline_receipt, receipt_no),
+        (box_x + 2 * mm, baseline_date, "Date"),
+        (value_right - c.stringWidth(date_str, "Helvetica", 9), baseline_date, date_str),
+    ]
+
+    # Vertical divider between label and value for both rows
+    col_x = box_x + box_w * 0.5
+    frame.moveTo(col_x, header_top)
+    frame.lineTo(col_x, header_top - 2 * receipt_box_height)
+
+    # Address (under logo/name)
+    header_bottom = y  # after address (or logo if no address)
+    if school_address:
+        addr_line = school_address.replace("\n", " ").strip()[:110]
+        if addr_line:
+            header_texts.append((margin_x + 2 * mm, y - 1 * mm, addr_line))
             y -= small_h
-        y -= 4 * mm
-
-        # === Notes / Authorised Signatory row ===
-        c.setLineWidth(0.5)
-        box_top = y
-        box_bottom = box_top - 25 * mm
-        mid_x = margin_x + (w - 2 * margin_x) / 2
-        # outer box
-        c.rect(margin_x, box_bottom, w - 2 * margin_x, box_top - box_bottom, stroke=1, fill=0)
-        # vertical separator
-        c.line(mid_x, box_bottom, mid_x, box_top)
-        c.setFont("Helvetica-Bold", 9)
-        c.drawString(margin_x + 2 * mm, box_top - 4 * mm, "Notes:")
-        c.drawString(mid_x + 2 * mm, box_top - 4 * mm, "Authorised Signatory:")
-        y = box_bottom - 8 * mm
-
-        # === Footer: date & mode (small), then address/footer ===
-        c.setFont("Helvetica", 8)
-        c.drawString(margin_x, y, f"Date: {date_str}")
-        payment_mode = getattr(billing, "payment_mode", "cash") or "cash"
-        c.drawString(margin_x + 50 * mm, y, f"Mode: {payment_mode.capitalize()}")
-        if payment_mode == "online" and getattr(billing, "transaction_number", None):
-            c.drawString(margin_x + 100 * mm, y, f"Txn: {billing.transaction_number[:40]}")
-        # Bottom section: trust logo (left) and address (right)
-        y_logo = margin_y + 6 * mm
-        if trust_logo_url:
-            try:
-                t_img = _load_image(trust_logo_url)
-                if t_img is None:
-                    raise ValueError("Could not load trust logo")
-                tw, th = t_img.getSize()
-                max_h = 10 * mm
-                max_w = 55 * mm
-                t_scale = min(max_h / th, max_w / tw)
-                logo_h2 = th * t_scale
-                logo_w2 = tw * t_scale
-                c.drawImage(
-                    t_img,
-                    margin_x,
-                    y_logo - logo_h2 + 2 * mm,
-                    width=logo_w2,
-                    height=logo_h2,
-                    preserveAspectRatio=True,
-                    mask="auto",
-                )
-            except Exception as e:
-                logger.debug("Trust logo load failed: %s", e)
-
-        # Trust / school address in two right-aligned lines (slightly lower than logo)
-        c.setFont("Helvetica", 8)
-        footer_source = trust_address or school_address or school_name
-        footer_source = footer_source.strip()
-        line1 = ""
-        line2 = ""
-        if "|" in footer_source:
-            # Explicit manual split: "Line1|Line2"
-            parts = [p.strip() for p in footer_source.split("|", 1)]
-            line1 = parts[0]
-            line2 = parts[1] if len(parts) > 1 else ""
-        else:
-            # Try to split on comma roughly mid-way for two lines
-            n = len(footer_source)
-            split_idx = footer_source.rfind(",", 0, n // 2)
-            if split_idx == -1:
-                split_idx = footer_source.find(",", n // 2)
-            if split_idx != -1:
-                line1 = footer_source[:split_idx].strip(" ,")
-                line2 = footer_source[split_idx + 1 :].strip(" ,")
-            else:
-                line1 = footer_source
-        y_addr = margin_y + 2 * mm
-        if line2:
-            c.drawRightString(w - margin_x, y_addr + small_h, line1[:100])
-            c.drawRightString(w - margin_x, y_addr, line2[:100])
-        else:
-            c.drawRightString(w - margin_x, y_addr, line1[:100])
+        y -= 3 * mm
+    _draw_texts(c, "Helvetica", 9, header_texts)
+
+    # Outer border around logo + address + receipt/date block
+    header_bottom = min(header_bottom, y)
+    frame.rect(margin_x, header_bottom, w - 2 * margin_x, header_top - header_bottom)
+
+    # === Student details rows (bordered, aligned) ===
+    if context:
+        labels: list[tuple[float, float, str]] = []
+        values: list[tuple[float, float, str]] = []
+
+        # Row 1: Name of the Student (full-width box)
+        row1_height = 8 * mm
+        row1_top = y
+        row1_bottom = row1_top - row1_height
+        # Vertically center baseline in the row for ~10pt text
+        baseline1 = (row1_top + row1_bottom) / 2 - 1.8 * mm
+        if context.get("student_name"):
+            labels.append((margin_x + 2 * mm, baseline1, "Name of the Student : "))
+            values.append((margin_x + 40 * mm, baseline1, str(context["student_name"])[:60]))
+        # Border for row 1
+        frame.rect(margin_x, row1_bottom, w - 2 * margin_x, row1_height)
+
+        # Row 2: Admission Number | Class (two columns with borders)
+        row2_height = 8 * mm
+        row2_top = row1_bottom
+        row2_bottom = row2_top - row2_height
+        baseline2 = (row2_top + row2_bottom) / 2 - 1.8 * mm
+
+        adm = str(context.get("admission_number", "")) if context.get("admission_number") else ""
+        cls = str(context.get("class_name", "")) if context.get("class_name") else ""
+
+        # Column boundary (middle of the row)
+        col_class_x = margin_x + (w - 2 * margin_x) / 2
+
+        # Admission Number (left cell)
+        labels.append((margin_x + 2 * mm, baseline2, "Admission Number:"))
+        values.append((margin_x + 2 * mm + _LABEL_WIDTHS["admission_number"], baseline2, adm[:20]))
+
+        # Class (right cell)
+        if cls:
+            labels.append((col_class_x + 2 * mm, baseline2, "Class:"))
+            values.append((col_class_x + 2 * mm + _LABEL_WIDTHS["class"], baseline2, cls[:20]))
+
+        _draw_texts(c, "Helvetica-Bold", 10, labels)
+        _draw_texts(c, "Helvetica", 10, values)
+
+        # Outer box and column separator for row 2
+        frame.rect(margin_x, row2_bottom, w - 2 * margin_x, row2_height)
+        frame.moveTo(col_class_x, row2_bottom)
+        frame.lineTo(col_class_x, row2_top)
+
+        y = row2_bottom - 8 * mm
+
+    # === Title ===
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString((w - _TITLE_W) / 2, y, _TITLE)
+    # Slight spacing below title (tighter than before)
+    y -= line_h * 0.8
+
+    # Horizontal line above table
+
+
+    # === Components table: header + rows + total (with full borders) ===
+    receipt_total = float(billing["amount_paid"] or 0)
+    components = (context or {}).get("components")
+    data = [["Fee Structure", "Amount"]]
+    if isinstance(components, list) and len(components) > 0:
+        # Rows and total in one pass over the components
+        receipt_total = 0.0
+        for name, amt in components:
+            amount = float(amt or 0)
+            receipt_total += amount
+            data.append([name or "", f"Rs.{amount:,.2f}"])
+    else:
+        data.append([billing["fee_structure_name"], f"Rs.{billing['amount_paid']:,.2f}"])
+
+    # Total row
+    data.append(["Total", f"Rs.{receipt_total:,.2f}"])
+
+    table_width = w - 2 * margin_x
+    col_widths = [table_width * 0.7, table_width * 0.3]
+    table = Table(data, colWidths=col_widths)
+    table.setStyle(_RECEIPT_TABLE_STYLE)
+    tw, th = table.wrapOn(c, table_width, h)
+    table.drawOn(c, margin_x, y - th)
+    y -= th + 4 * mm
+
+    # === Amount in words ===
+    words = _number_to_words_indian(receipt_total)
+    word_lines = textwrap.wrap(words, width=50, break_long_words=False)
+    t = c.beginText(margin_x, y)
+    t.setFont("Helvetica", 9)
+    t.setLeading(small_h)
+    for line in word_lines:
+        t.textLine(line)
+    c.drawText(t)
+    y -= small_h * len(word_lines)
+    y -= 4 * mm
+
+    # === Notes / Authorised Signatory row ===
+    box_top = y
+    box_bottom = box_top - 25 * mm
+    mid_x = margin_x + (w - 2 * margin_x) / 2
+    # outer box
+    frame.rect(margin_x, box_bottom, w - 2 * margin_x, box_top - box_bottom)
+    # vertical separator
+    frame.moveTo(mid_x, box_bottom)
+    frame.lineTo(mid_x, box_top)
+    _draw_texts(
+        c,
+        "Helvetica-Bold",
+        9,
+        [
+            (margin_x + 2 * mm, box_top - 4 * mm, "Notes:"),
+            (mid_x + 2 * mm, box_top - 4 * mm, "Authorised Signatory:"),
+        ],
+    )
+    y = box_bottom - 8 * mm
+
+    # === Footer: date & mode (small), then address/footer ===
+    payment_mode = billing["payment_mode"] or "cash"
+    footer_texts = [
+        (margin_x, y, f"Date: {date_str}"),
+        (margin_x + 50 * mm, y, f"Mode: {payment_mode.capitalize()}"),
+    ]
+    if payment_mode == "online" and billing["transaction_number"]:
+        footer_texts.append((margin_x + 100 * mm, y, f"Txn: {billing['transaction_number'][:40]}"))
+    # Bottom section: trust logo (left) and address (right)
+    y_logo = margin_y + 6 * mm
+    if trust_logo_url:
+        try:
+            t_img = _fetch_logo(trust_logo_url)
+            if t_img is None:
+                raise ValueError("Could not load trust logo")
+            tw, th = t_img.getSize()
+            max_h = 10 * mm
+            max_w = 55 * mm
+            t_scale = min(max_h / th, max_w / tw)
+            logo_h2 = th * t_scale
+            logo_w2 = tw * t_scale
+            c.drawImage(
+                t_img,
+                margin_x,
+                y_logo - logo_h2 + 2 * mm,
+                width=logo_w2,
+                height=logo_h2,
+                preserveAspectRatio=True,
+                mask="auto",
+            )
+        except Exception as e:
+            logger.debug("Trust logo load failed: %s", e)
+
+    # Trust / school address in two right-aligned lines (slightly lower than logo)
+    footer_source = trust_address or school_address or school_name
+    footer_source = footer_source.strip()
+    line1 = footer_source
+    line2 = ""
+    if "|" in footer_source:
+        # Explicit manual split: "Line1|Line2"
+        parts = [p.strip() for p in footer_source.split("|", 1)]
+        line1 = parts[0]
+        line2 = parts[1] if len(parts) > 1 else ""
+    elif footer_source:
+        # Split on the last comma before the midpoint (else the first one after it)
+        parts = footer_source.split(",")
+        if len(parts) > 1:
+            half = len(footer_source) // 2
+            k, comma_at = 1, len(parts[0])
+            while k < len(parts) - 1 and comma_at + 1 + len(parts[k]) < half:
+                comma_at += 1 + len(parts[k])
+                k += 1
+            line1 = ",".join(parts[:k]).strip(" ,")
+            line2 = ",".join(parts[k:]).strip(" ,")
+    y_addr = margin_y + 2 * mm
+    addr_lines = [(y_addr + small_h, line1), (y_addr, line2)] if line2 else [(y_addr, line1)]
+    for line_y, line in addr_lines:
+        line = line[:100]
+        footer_texts.append((w - margin_x - c.stringWidth(line, "Helvetica", 8), line_y, line))
+    _draw_texts(c, "Helvetica", 8, footer_texts)
+
+    c.setLineWidth(0.5)
+    c.drawPath(frame, stroke=1, fill=0)
+    try:
         c.save()
-        return buf.getvalue()
     except Exception as e:
         logger.warning("ReportLab PDF failed: %s", e)
         return None
+    return buf.getvalue()
 
 
 async def generate_receipt_pdf(billing: Billing, context: ReceiptContext = None) -> str | None:
     """Generate PDF, upload to S3, return URL. Uses same A5 layout when context provided."""
-    url = await _generate_weasyprint(billing, context)
+    url = await _generate_reportlab(billing, context)
     if url:
         return url
-    url = await _generate_reportlab(billing, context)
-    return url
+    return await _generate_weasyprint(billing, context)
 
 
 async def _generate_weasyprint(billing: Billing, context: ReceiptContext = None) -> str | None:
-    try:
-        from weasyprint import HTML
-    except (ImportError, OSError):
+    HTML = _weasyprint_html()
+    if HTML is None:
         return None
     try:
         html = _receipt_html(billing, context)
         pdf_bytes = HTML(string=html).write_pdf()
-        key = f"receipts/{billing.student_id}/{billing.id}/{uuid.uuid4().hex}.pdf"
+        key = _receipt_key(billing)
         return await _upload_or_none(key, pdf_bytes)
     except Exception as e:
         logger.warning("WeasyPrint PDF failed: %s", e)
         return None
 
 
+def _receipt_key(billing: Billing, token: str | None = None) -> str:
+    return f"receipts/{billing.student_id}/{billing.id}/{token or secrets.token_hex(16)}.pdf"
+
+
+def _batch_tokens(n: int) -> list[str]:
+    """n random 32-hex-char key tokens from a single urandom read."""
+    raw = os.urandom(16 * n).hex()
+    return [raw[i : i + 32] for i in range(0, len(raw), 32)]
+
+
 async def _upload_or_none(key: str, pdf_bytes: bytes) -> str | None:
     try:
         return await upload_receipt_to_s3(key, pdf_bytes)
@@ -439,13 +612,38 @@ async def _upload_or_none(key: str, pdf_bytes: bytes) -> str | None:
 
 
 async def _generate_reportlab(billing: Billing, context: ReceiptContext = None) -> str | None:
-    pdf_bytes = _reportlab_pdf_bytes(billing, context)
+    pdf_bytes = await _render_pdf(billing, context)
     if not pdf_bytes:
         return None
-    key = f"receipts/{billing.student_id}/{billing.id}/{uuid.uuid4().hex}.pdf"
+    key = _receipt_key(billing)
     return await _upload_or_none(key, pdf_bytes)
 
 
+async def generate_receipts_pdf_bulk(
+    billings: list[Billing], contexts: list[ReceiptContext]
+) -> list[str | None]:
+    """Generate (ReportLab) and upload receipts for many billings; URLs in billing order, None on failure."""
+    now = datetime.utcnow()
+    pdfs = await asyncio.gather(
+        *(_render_pdf(billing, ctx, now) for billing, ctx in zip(billings, contexts))
+    )
+    positions: list[int] = []
+    items: list[tuple[str, bytes]] = []
+    tokens = _batch_tokens(len(billings))
+    for i, (billing, pdf_bytes) in enumerate(zip(billings, pdfs)):
+        if pdf_bytes:
+            positions.append(i)
+            items.append((_receipt_key(billing, tokens[i]), pdf_bytes))
+
+    urls: list[str | None] = [None] * len(billings)
+    for i, url in zip(positions, await bulk_upload_receipts(items)):
+        urls[i] = url
+    failed = urls.count(None)
+    if failed:
+        logger.warning("Bulk receipts: %d of %d not generated or uploaded", failed, len(billings))
+    return urls
+
+
 def _receipt_html(b: Billing, context: ReceiptContext = None) -> str:
     """Fallback HTML for WeasyPrint (simple layout with optional components table)."""
     school_name = (settings.school_name or settings.app_name).strip()
@@ -453,7 +651,7 @@ def _receipt_html(b: Billing, context: ReceiptContext = None) -> str:
     payment_mode = getattr(b, "payment_mode", "cash") or "cash"
     txn = getattr(b, "transaction_number", None) or ""
     paid_at = b.paid_at or datetime.utcnow()
-    date_str = paid_at.strftime("%Y-%m-%d") if hasattr(paid_at, "strftime") else str(paid_at)
+    date_str = _fmt_date(paid_at, "%Y-%m-%d") if isinstance(paid_at, datetime) else str(paid_at)
     ctx = context or {}
     student_line = f"<p>Student: {ctx.get('student_name', b.student_id)}</p>"
     class_line = f"<p>Class: {ctx.get('class_name', '')}</p>" if ctx.get("class_name") else ""
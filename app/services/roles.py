@@ -4,13 +4,33 @@ from __future__ import annotations
 from datetime import datetime
 import re
 
+from beanie import BulkWriter, PydanticObjectId
+
 from app.config import settings
-from app.models.role import PermissionSet, Role, RolePermissionInput, RoleResponse
+from app.models.role import (
+    ACTION_BITS,
+    PermissionSet,
+    Role,
+    RolePermissionInput,
+    RoleResponse,
+    pset_from_flags,
+    pset_from_int,
+    pset_to_int,
+)
 from app.rbac import DEFAULT_ROLE_PERMISSIONS, SYSTEM_MODULES
+from app.services.cache import TTLCache
+
+# Only the admin role listing is cached. Permission checks read Role directly,
+# so a revoked permission takes effect in every worker immediately.
+_role_list_cache = TTLCache(ttl=60, maxsize=1)
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_MODULE_KEYS: tuple[str, ...] = tuple(m["key"] for m in SYSTEM_MODULES)
+_DEFAULT_PERM_ZERO = pset_from_int(0)
 
 
 def slugify_role_key(name: str) -> str:
-    key = re.sub(r"[^a-z0-9]+", "_", name.strip().lower()).strip("_")
+    key = _SLUG_RE.sub("_", name.strip().lower()).strip("_")
     if not key:
         key = "role"
     return key
@@ -19,20 +39,14 @@ def slugify_role_key(name: str) -> str:
 def _permissions_map_from_inputs(items: list[RolePermissionInput]) -> dict[str, PermissionSet]:
     permissions_map: dict[str, PermissionSet] = {}
     for item in items:
-        permissions_map[item.module] = PermissionSet(
-            view=item.view,
-            add=item.add,
-            edit=item.edit,
-            delete=item.delete,
-        )
+        permissions_map[item.module] = pset_from_int(pset_to_int(item))
     return permissions_map
 
 
 def _permissions_inputs_from_map(permissions: dict[str, PermissionSet]) -> list[RolePermissionInput]:
     outputs: list[RolePermissionInput] = []
-    module_keys = [m["key"] for m in SYSTEM_MODULES]
-    for module in module_keys:
-        perm = permissions.get(module, PermissionSet())
+    for module in _MODULE_KEYS:
+        perm = permissions.get(module, _DEFAULT_PERM_ZERO)
         outputs.append(
             RolePermissionInput(
                 module=module,
@@ -64,44 +78,81 @@ def role_to_response(role: Role) -> RoleResponse:
     )
 
 
+async def list_role_responses() -> list[dict]:
+    """GET /roles payload, cached; role writes call invalidate_role_cache()."""
+    items = _role_list_cache.get("all")
+    if items is None:
+        roles = await Role.find_all().sort("name").to_list()
+        items = [role_to_response(role).model_dump() for role in roles]
+        _role_list_cache.set("all", items)
+    return items
+
+
+def invalidate_role_cache() -> None:
+    _role_list_cache.clear()
+
+
 def has_permission(role: Role | None, module: str, action: str) -> bool:
     if not role or not role.is_active:
         return False
-    permission = role.permissions.get(module)
-    if not permission:
+    bit = ACTION_BITS.get(action)
+    if bit is None:
         return False
-    return bool(getattr(permission, action, False))
+    return bool(role.permission_bits().get(module, 0) & bit)
 
 
 async def ensure_default_roles() -> None:
     """Ensure built-in roles exist and include current module keys."""
-    module_keys = [m["key"] for m in SYSTEM_MODULES]
+    existing = {
+        role.key: role
+        async for role in Role.find({"key": {"$in": list(DEFAULT_ROLE_PERMISSIONS.keys())}})
+    }
+    to_insert: list[Role] = []
+    updates: list[tuple[PydanticObjectId, dict]] = []
+    now = datetime.utcnow()
     for role_key, defaults in DEFAULT_ROLE_PERMISSIONS.items():
-        role = await Role.find_one(Role.key == role_key)
+        role = existing.get(role_key)
         default_permissions: dict[str, PermissionSet] = {}
-        for module in module_keys:
+        for module in _MODULE_KEYS:
             conf = defaults.get(module, {"view": False, "add": False, "edit": False, "delete": False})
-            default_permissions[module] = PermissionSet(**conf)
+            default_permissions[module] = pset_from_flags(conf)
 
         if role:
-            merged_permissions: dict[str, PermissionSet] = {}
-            for module in module_keys:
-                # Keep existing customized permissions; only backfill missing modules.
-                merged_permissions[module] = role.permissions.get(module, default_permissions[module])
-            role.is_default = True
-            role.permissions = merged_permissions
-            role.name = role.name or role_key.replace("_", " ").title()
-            role.updated_at = datetime.utcnow()
-            await role.save()
+            # Keep existing customized permissions; only backfill missing modules.
+            merged_bits = {
+                module: pset_to_int(role.permissions.get(module, default_permissions[module]))
+                for module in _MODULE_KEYS
+            }
+            updates.append(
+                (
+                    role.id,
+                    {
+                        "is_default": True,
+                        "permissions": merged_bits,
+                        "name": role.name or role_key.replace("_", " ").title(),
+                        "updated_at": now,
+                    },
+                )
+            )
             continue
 
-        role = Role(
-            key=role_key,
-            name=role_key.replace("_", " ").title(),
-            description=f"Default {role_key.replace('_', ' ').title()} role",
-            is_active=True,
-            is_default=True,
-            permissions=default_permissions,
+        to_insert.append(
+            Role(
+                key=role_key,
+                name=role_key.replace("_", " ").title(),
+                description=f"Default {role_key.replace('_', ' ').title()} role",
+                is_active=True,
+                is_default=True,
+                permissions=default_permissions,
+            )
         )
-        await role.insert()
-
+    if to_insert:
+        await Role.insert_many(to_insert)
+    if updates:
+        # Queued into one bulk_write, sent when the writer exits.
+        async with BulkWriter() as bulk_writer:
+            for role_id, fields in updates:
+                await Role.find_one(Role.id == role_id).update(
+                    {"$set": fields}, bulk_writer=bulk_writer
+                )
+    invalidate_role_cache()
@@ -1,27 +1,99 @@
 """AWS S3: photos and PDF receipts."""
-import uuid
+import functools
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import BinaryIO, AsyncGenerator
 import asyncio
 from io import BytesIO
 from app.config import settings
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+__all__ = [
+    "get_s3",
+    "upload_photo_to_s3",
+    "upload_receipt_to_s3",
+    "bulk_upload_receipts",
+    "upload_album_photo_to_s3",
+    "upload_banner_to_s3",
+    "delete_from_s3",
+]
+
 _s3 = None
+_s3_lock = threading.Lock()
+
+_S3_MAX_CONNECTIONS = 50
+
+# One client for the process: a larger keep-alive pool so concurrent uploads
+# reuse TLS connections, bounded timeouts and standard-mode retries.
+_S3_CONFIG = Config(
+    max_pool_connections=_S3_MAX_CONNECTIONS,
+    retries={"max_attempts": 3, "mode": "standard"},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=15,
+)
 
 
 def get_s3():
     global _s3
     if _s3 is None:
-        _s3 = boto3.client(
-            "s3",
-            region_name=settings.aws_region,
-            aws_access_key_id=settings.aws_access_key_id or None,
-            aws_secret_access_key=settings.aws_secret_access_key or None,
-        )
+        # Uploads also run on worker threads; build the client only once.
+        with _s3_lock:
+            if _s3 is None:
+                _s3 = boto3.client(
+                    "s3",
+                    region_name=settings.aws_region,
+                    aws_access_key_id=settings.aws_access_key_id or None,
+                    aws_secret_access_key=settings.aws_secret_access_key or None,
+                    config=_S3_CONFIG,
+                )
     return _s3
 
 
+# S3 calls get their own pool, one thread per pooled connection, so bursts of
+# uploads neither queue behind nor starve the default to_thread executor.
+_s3_executor = ThreadPoolExecutor(max_workers=_S3_MAX_CONNECTIONS, thread_name_prefix="s3")
+
+
+async def _run_s3(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_s3_executor, functools.partial(func, *args))
+
+
+def _put_sync(bucket: str, key: str, body, content_type: str) -> None:
+    get_s3().put_object(Bucket=bucket, Key=key, Body=body, ContentType=content_type)
+
+
+def _delete_sync(bucket: str, key: str) -> None:
+    get_s3().delete_object(Bucket=bucket, Key=key)
+
+
+# Photos under this size go up in a single PUT; larger (or unknown-size) ones
+# use the managed transfer, which switches to multipart past the threshold.
+_SINGLE_PUT_MAX_BYTES = 5 * 1024 * 1024
+_MULTIPART_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024, max_concurrency=4)
+
+
+def _upload_fileobj_sync(bucket: str, key: str, fileobj: BinaryIO, content_type: str) -> None:
+    get_s3().upload_fileobj(
+        fileobj, bucket, key, ExtraArgs={"ContentType": content_type}, Config=_MULTIPART_CONFIG
+    )
+
+
+async def _upload_file(file, bucket: str, key: str) -> None:
+    """Stream an UploadFile's spooled file to S3 without reading it into memory."""
+    content_type = file.content_type or "image/jpeg"
+    size = getattr(file, "size", None)
+    if size is not None and size < _SINGLE_PUT_MAX_BYTES:
+        await _run_s3(_put_sync, bucket, key, file.file, content_type)
+    else:
+        await _run_s3(_upload_fileobj_sync, bucket, key, file.file, content_type)
+
+
 async def upload_photo_to_s3(
     file,
     *,
@@ -30,20 +102,35 @@ async def upload_photo_to_s3(
 ) -> tuple[str, str]:
     """Upload photo; return (public_url, s3_key)."""
     ext = (file.filename or "").split(".")[-1] or "jpg"
-    key = f"photos/{student_id}/{activity_id}/{uuid.uuid4().hex}.{ext}"
+    key = f"photos/{student_id}/{activity_id}/{secrets.token_hex(16)}.{ext}"
     bucket = settings.s3_bucket_photos
-    content = await file.read()
-    get_s3().put_object(Bucket=bucket, Key=key, Body=content, ContentType=file.content_type or "image/jpeg")
+    await _upload_file(file, bucket, key)
     url = f"https://{bucket}.s3.{settings.aws_region}.amazonaws.com/{key}"
     return url, key
 
 
 async def upload_receipt_to_s3(key: str, body: bytes, content_type: str = "application/pdf") -> str:
     bucket = settings.s3_bucket_receipts
-    get_s3().put_object(Bucket=bucket, Key=key, Body=body, ContentType=content_type)
+    await _run_s3(_put_sync, bucket, key, body, content_type)
     return f"https://{bucket}.s3.{settings.aws_region}.amazonaws.com/{key}"
 
 
+async def bulk_upload_receipts(
+    items: list[tuple[str, bytes]], content_type: str = "application/pdf"
+) -> list[str | None]:
+    """Upload (key, body) receipts concurrently; URLs in item order, None where a PUT failed."""
+    bucket = settings.s3_bucket_receipts
+    results = await asyncio.gather(
+        *(_run_s3(_put_sync, bucket, key, body, content_type) for key, body in items),
+        return_exceptions=True,
+    )
+    return [
+        None if isinstance(result, BaseException)
+        else f"https://{bucket}.s3.{settings.aws_region}.amazonaws.com/{key}"
+        for (key, _), result in zip(items, results)
+    ]
+
+
 async def upload_album_photo_to_s3(
     file,
     *,
@@ -51,15 +138,9 @@ async def upload_album_photo_to_s3(
 ) -> tuple[str, str]:
     """Upload photo for album; return (public_url, s3_key)."""
     ext = (file.filename or "").split(".")[-1] or "jpg"
-    key = f"gallery/{album_id}/{uuid.uuid4().hex}.{ext}"
+    key = f"gallery/{album_id}/{secrets.token_hex(16)}.{ext}"
     bucket = settings.s3_bucket_photos
-    content = await file.read()
-    get_s3().put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=content,
-        ContentType=file.content_type or "image/jpeg",
-    )
+    await _upload_file(file, bucket, key)
     url = f"https://{bucket}.s3.{settings.aws_region}.amazonaws.com/{key}"
     return url, key
 
@@ -67,26 +148,16 @@ async def upload_album_photo_to_s3(
 async def delete_from_s3(key: str, bucket: str = settings.s3_bucket_photos) -> None:
     """Delete object from S3."""
     try:
-        get_s3().delete_object(Bucket=bucket, Key=key)
+        await _run_s3(_delete_sync, bucket, key)
     except ClientError:
         pass
 
 
-def _upload_banner_sync(file: bytes, key: str, content_type: str) -> None:
-    get_s3().put_object(
-        Bucket=settings.s3_bucket_photos,
-        Key=key,
-        Body=file,
-        ContentType=content_type or "image/jpeg",
-    )
-
-
 async def upload_banner_to_s3(file: bytes, filename: str, content_type: str) -> tuple[str, str]:
     """Upload banner image; return (public_url, s3_key)."""
-    import asyncio
     ext = (filename or "").split(".")[-1] or "jpg"
-    key = f"banners/{uuid.uuid4().hex}.{ext}"
+    key = f"banners/{secrets.token_hex(16)}.{ext}"
     bucket = settings.s3_bucket_photos
-    await asyncio.to_thread(_upload_banner_sync, file, key, content_type or "image/jpeg")
+    await _run_s3(_put_sync, bucket, key, file, content_type or "image/jpeg")
     url = f"https://{bucket}.s3.{settings.aws_region}.amazonaws.com/{key}"
-    return url, key
\ No newline at end of file
+    return url, key
@@ -0,0 +1,28 @@
+import os
+
+os.environ.setdefault("DEBUG", "true")
+
+from app.services.announcements import _scan_html, plain_text_from_html  # noqa: E402
+
+
+def test_scan_html_finds_img_and_url():
+    html = '<p>Hi <img src="https://x.test/a.png"> see https://x.test/b.jpg</p>'
+    text, img_src, image_url = _scan_html(html)
+    assert img_src == "https://x.test/a.png"
+    assert image_url == "https://x.test/b.jpg"
+    assert text == "Hi see https://x.test/b.jpg"
+
+
+def test_scan_html_stray_lt_before_img():
+    text, img_src, _ = _scan_html('<<img src="https://x.test/a.png">')
+    assert img_src == "https://x.test/a.png"
+    assert text == "<"
+
+
+def test_plain_text_keeps_lone_lt_outside_tags():
+    assert plain_text_from_html("a < b <b>bold</b> c") == "a < b bold c"
+
+
+def test_scan_html_without_text_stops_at_first_img():
+    html = '<p>Hi</p><img src=" "><img src="https://x.test/a.png"><img src="https://x.test/b.png">'
+    assert _scan_html(html, text=False) == ("", "https://x.test/a.png", None)
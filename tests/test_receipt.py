@@ -0,0 +1,30 @@
+import os
+
+os.environ.setdefault("DEBUG", "true")
+
+import pytest  # noqa: E402
+
+from app.services.receipt import _number_to_words_indian  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "amount, words",
+    [
+        (0, "Rupees Zero Only"),
+        (99999, "Rupees Ninety Nine Thousand Nine Hundred Ninety Nine Only"),
+        (100000, "Rupees One Lakh Only"),
+        (100001, "Rupees One Lakh One Only"),
+        (9999999, "Rupees Ninety Nine Lakh Ninety Nine Thousand Nine Hundred Ninety Nine Only"),
+        (10000000, "Rupees One Crore Only"),
+        (10100000, "Rupees One Crore One Lakh Only"),
+        (123456789, "Rupees Twelve Crore Thirty Four Lakh Fifty Six Thousand Seven Hundred Eighty Nine Only"),
+        (52000.6, "Rupees Fifty Two Thousand One Only"),
+    ],
+)
+def test_number_to_words_indian(amount, words):
+    assert _number_to_words_indian(amount) == words
+
+
+@pytest.mark.parametrize("amount", [100000, 10000000, 10100000, 200000000, 1000001])
+def test_number_to_words_indian_has_no_double_spaces(amount):
+    assert "  " not in _number_to_words_indian(amount)
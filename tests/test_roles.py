@@ -0,0 +1,44 @@
+import os
+
+os.environ.setdefault("DEBUG", "true")
+
+import pytest  # noqa: E402
+
+from app.models.role import ACTION_BITS, PermissionSet, Role, pset_from_int, pset_to_int  # noqa: E402
+from app.services.roles import has_permission  # noqa: E402
+
+
+def _role(permissions, is_active=True):
+    # Role() needs an initialised collection; run the permissions validators by hand instead.
+    permissions = Role.validate_permissions(Role.coerce_permissions(permissions))
+    return Role.model_construct(key="r", name="R", is_active=is_active, permissions=permissions)
+
+
+def test_legacy_flag_dict_coerces_to_permission_set():
+    role = _role({"students": {"view": True, "edit": True}})
+    assert role.permissions["students"] == PermissionSet(view=True, edit=True)
+    assert role.permission_bits() == {"students": 0b0101}
+
+
+def test_int_bitmask_coerces_to_permission_set():
+    role = _role({"students": 0b1010})
+    assert role.permissions["students"] == PermissionSet(add=True, delete=True)
+
+
+@pytest.mark.parametrize("bits", range(16))
+def test_permission_set_int_round_trip(bits):
+    assert pset_to_int(pset_from_int(bits)) == bits
+
+
+def test_has_permission_matches_permission_bits():
+    role = _role({"students": {"view": True, "delete": True}, "attendance": 0b0110})
+    bits = role.permission_bits()
+    for module in ("students", "attendance", "staff"):
+        for action, bit in ACTION_BITS.items():
+            assert has_permission(role, module, action) == bool(bits.get(module, 0) & bit)
+
+
+def test_has_permission_denies_inactive_role_and_unknown_action():
+    assert not has_permission(_role({"students": 0b1111}, is_active=False), "students", "view")
+    assert not has_permission(_role({"students": 0b1111}), "students", "approve")
+    assert not has_permission(None, "students", "view")